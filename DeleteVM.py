@@ -1,17 +1,38 @@
-import subprocess
-import json
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import HttpResponseError
+from azure.mgmt.resource import ResourceManagementClient
 from tabulate import tabulate
 from time import time
+from azure_clients import get_client
+from azure_credentials import get_shared_credential
+from catalog_cache import cached_subscriptions
 
-def fetch_resource_groups():
+def select_subscription(credential):
     """
-    Fetches the list of resource groups using Azure CLI.
+    Lets the user pick the subscription to work in (picked automatically
+    when there is only one). Returns its ID, or None.
+    """
+    subscriptions = cached_subscriptions(credential)
+    if len(subscriptions) == 1:
+        return subscriptions[0]['subscription_id']
+
+    rows = [[idx, sub['subscription_id'], sub['display_name'], sub['state']] for idx, sub in enumerate(subscriptions, 1)]
+    print("\nAvailable Subscriptions:")
+    print(tabulate(rows, headers=["Option", "Subscription ID", "Name", "State"], tablefmt="grid"))
+
+    choice = input("\nSelect subscription (enter number): ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(subscriptions):
+        print("Invalid subscription selection.")
+        return None
+    return subscriptions[int(choice) - 1]['subscription_id']
+
+def fetch_resource_groups(resource_client):
+    """
+    Fetches the list of resource groups using the Azure SDK.
     Returns a dictionary of resource groups.
     """
     try:
-        command = "az group list --output json"
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
-        resource_groups = json.loads(result.stdout)
+        resource_groups = list(resource_client.resource_groups.list())
 
         if not resource_groups:
             print("No resource groups found.")
@@ -22,28 +43,28 @@ def fetch_resource_groups():
         rg_details = {}
 
         for idx, rg in enumerate(resource_groups, 1):
-            rows.append([idx, rg["name"], rg["location"], rg["properties"]["provisioningState"]])
-            rg_details[str(idx)] = rg["name"]
+            rows.append([idx, rg.name, rg.location, rg.properties.provisioning_state])
+            rg_details[str(idx)] = rg.name
 
         print("\nAvailable Resource Groups:")
         print(tabulate(rows, headers=headers, tablefmt="grid"))
         return rg_details
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching resource groups: {e.stderr}")
+    except HttpResponseError as e:
+        print(f"Error fetching resource groups: {e.message}")
         return {}
 
-def fetch_resources_in_groups(resource_groups):
+def fetch_resources_in_groups(resource_client, resource_groups):
     """
-    Fetches all resources in specified resource groups.
+    Fetches all resources in specified resource groups, listing the
+    groups concurrently.
     """
     try:
-        all_resources = []
-        for rg in resource_groups:
-            command = f"az resource list --resource-group {rg} --output json"
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
-            resources = json.loads(result.stdout)
-            all_resources.extend(resources)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(resource_groups), 16))) as executor:
+            listings = executor.map(
+                lambda rg: list(resource_client.resources.list_by_resource_group(rg)), resource_groups
+            )
+            all_resources = [resource for listing in listings for resource in listing]
 
         if not all_resources:
             print(f"No resources found in the selected resource groups.")
@@ -56,10 +77,10 @@ def fetch_resources_in_groups(resource_groups):
         for idx, resource in enumerate(all_resources, 1):
             rows.append([
                 idx, 
-                resource["name"], 
-                resource["type"], 
-                resource["resourceGroup"],
-                resource["location"]
+                resource.name, 
+                resource.type, 
+                resource.id.split("/")[4],
+                resource.location
             ])
             resource_details[str(idx)] = resource
 
@@ -67,50 +88,80 @@ def fetch_resources_in_groups(resource_groups):
         print(tabulate(rows, headers=headers, tablefmt="grid"))
         return resource_details
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching resources: {e.stderr}")
+    except HttpResponseError as e:
+        print(f"Error fetching resources: {e.message}")
         return {}
 
-def delete_resource_groups(resource_groups):
+def delete_resource_groups(resource_client, resource_groups):
     """
-    Deletes multiple resource groups using Azure CLI.
+    Deletes multiple resource groups using the Azure SDK. Every delete is
+    started first and then waited on, so the groups are removed in
+    parallel.
     """
-    for rg in resource_groups:
+    def delete(rg):
         try:
             print(f"\nDeleting resource group '{rg}' and all its resources...")
             start_time = time()
 
-            command = f"az group delete --name {rg} --yes"
-            subprocess.run(command, shell=True, check=True)
+            resource_client.resource_groups.begin_delete(rg).result()
 
             end_time = time()
             total_time = end_time - start_time
             print(f"Resource group '{rg}' successfully deleted.")
             print(f"Total time taken for deletion: {total_time:.2f} seconds.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error deleting resource group '{rg}': {e.stderr}")
+        except HttpResponseError as e:
+            print(f"Error deleting resource group '{rg}': {e.message}")
 
-def delete_resources(resources):
+    with ThreadPoolExecutor(max_workers=max(1, len(resource_groups))) as executor:
+        list(executor.map(delete, resource_groups))
+
+_api_versions = {}
+
+def resolve_api_version(resource_client, resource_type):
+    """
+    Returns the newest non-preview API version of a resource type such as
+    'Microsoft.Network/networkInterfaces', as required by delete_by_id.
     """
-    Deletes selected resources using Azure CLI with dependency checks.
+    if resource_type not in _api_versions:
+        namespace, _, type_name = resource_type.partition("/")
+        provider = resource_client.providers.get(namespace)
+        for provider_type in provider.resource_types:
+            if provider_type.resource_type.lower() == type_name.lower():
+                versions = [v for v in provider_type.api_versions if "preview" not in v] or provider_type.api_versions
+                _api_versions[resource_type] = versions[0]
+                break
+        else:
+            raise ValueError(f"No API version found for resource type '{resource_type}'")
+    return _api_versions[resource_type]
+
+def delete_resources(resource_client, resources):
+    """
+    Deletes selected resources using the Azure SDK, one at a time in the
+    order given so dependants go before what they depend on.
     """
     for resource in resources:
         try:
-            name = resource["name"]
-            resource_type = resource["type"]
-            resource_group = resource["resourceGroup"]
+            name = resource.name
+            resource_type = resource.type
+            resource_group = resource.id.split("/")[4]
 
             print(f"Deleting resource '{name}' of type '{resource_type}' in resource group '{resource_group}'...")
-            command = f"az resource delete --name {name} --resource-group {resource_group} --resource-type {resource_type} --verbose"
-            subprocess.run(command, shell=True, check=True)
+            api_version = resolve_api_version(resource_client, resource_type)
+            resource_client.resources.begin_delete_by_id(resource.id, api_version).result()
             print(f"Resource '{name}' successfully deleted.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error deleting resource: {e.stderr}")
+        except (HttpResponseError, ValueError) as e:
+            print(f"Error deleting resource: {getattr(e, 'message', e)}")
 
 def main():
     print("Azure Resource Management Script")
     print("=" * 30)
 
+    credential = get_shared_credential()
+    subscription_id = select_subscription(credential)
+    if not subscription_id:
+        return
+    resource_client = get_client(ResourceManagementClient, credential, subscription_id)
+
     while True:
         print("\nOptions:")
         print("1. Delete entire resource groups")
@@ -123,7 +174,7 @@ def main():
             break
 
         # Fetch resource groups
-        resource_groups = fetch_resource_groups()
+        resource_groups = fetch_resource_groups(resource_client)
         if not resource_groups:
             continue
 
@@ -141,7 +192,7 @@ def main():
                           f"Type 'yes' to confirm: ")
             
             if confirm.lower() == "yes":
-                delete_resource_groups(selected_rgs)
+                delete_resource_groups(resource_client, selected_rgs)
 
         elif choice == "2":
             # Delete specific resources
@@ -153,7 +204,7 @@ def main():
                 continue
 
             # Fetch and display resources from selected resource groups
-            resources = fetch_resources_in_groups(selected_rgs)
+            resources = fetch_resources_in_groups(resource_client, selected_rgs)
             if not resources:
                 continue
 
@@ -177,7 +228,7 @@ def main():
             # Confirm deletion
             confirm = input(f"\nAre you sure you want to delete the selected resources? (yes/no): ")
             if confirm.lower() == "yes":
-                delete_resources(selected_resources)
+                delete_resources(resource_client, selected_resources)
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,32 @@
-import os
-import json
-from azure.identity import AzureCliCredential
+import argparse
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.network import NetworkManagementClient
 from azure.mgmt.resource import ResourceManagementClient
-from azure.mgmt.subscription import SubscriptionClient
+from azure.core.exceptions import ResourceNotFoundError
 from tabulate import tabulate
+from resource_graph import ResourceGraph
+from phase_timer import PhaseTimer, PHASES
+from lro_polling import expected_durations, expected_for
+from run_journal import RunJournal, new_run_id
+from benchmark_stats import summarize_trials, trial_samples, print_trial_summary, plot_trial_summary
+from azure_clients import get_client
+from azure_credentials import get_shared_credential
+from preflight import run_preflight
+from catalog_cache import cached_subscriptions, cached_regions
+from image_catalog import get_image_index
+from size_catalog import SizeIndex
+from start_barrier import StartBarrier
+from jsonl_log import DEPLOYMENT_LOG
+from results_writer import get_writer
+from results_store import get_store, image_label
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
+# How far back load_lro_history() looks for phase timings
+HISTORY_DAYS = 30
+
 def get_credentials():
-    return AzureCliCredential()
+    return get_shared_credential()
 
 def validate_vm_name(name):
     valid_name = ''.join(c for c in name if c.isalnum() or c == '-')
@@ -21,103 +38,141 @@ def validate_vm_name(name):
     return valid_name
 
 def list_subscriptions(credential):
-    subscription_client = SubscriptionClient(credential)
-    subscriptions = list(subscription_client.subscriptions.list())
+    subscriptions = cached_subscriptions(credential)
     
     headers = ["Option", "Subscription ID", "Name", "State"]
     rows = []
     
     for idx, sub in enumerate(subscriptions, 1):
-        rows.append([str(idx), sub.subscription_id, sub.display_name, sub.state])
+        rows.append([str(idx), sub['subscription_id'], sub['display_name'], sub['state']])
     
     print("\nAvailable Subscriptions:")
     print(tabulate(rows, headers=headers, tablefmt="grid"))
-    return {str(idx): sub.subscription_id for idx, sub in enumerate(subscriptions, 1)}
+    return {str(idx): sub['subscription_id'] for idx, sub in enumerate(subscriptions, 1)}
 
 def list_regions(credential, subscription_id):
-    subscription_client = SubscriptionClient(credential)
-    locations = list(subscription_client.subscriptions.list_locations(subscription_id))
+    locations = cached_regions(credential, subscription_id)
     
     headers = ["Option", "Name", "Display Name"]
     rows = []
     
     for idx, location in enumerate(locations, 1):
-        rows.append([str(idx), location.name, location.display_name])
+        rows.append([str(idx), location['name'], location['display_name']])
     
     print("\nAvailable Regions:")
     print(tabulate(rows, headers=headers, tablefmt="grid"))
-    return {str(idx): location.name for idx, location in enumerate(locations, 1)}
+    return {str(idx): location['name'] for idx, location in enumerate(locations, 1)}
+
+# Define most common VM sizes
+COMMON_VM_SIZES = [
+    {
+        'name': 'Standard_B1s',
+        'cores': 1,
+        'memory': 1,
+        'disks': 2
+    },
+    {
+        'name': 'Standard_B2s',
+        'cores': 2,
+        'memory': 4,
+        'disks': 4
+    },
+    {
+        'name': 'Standard_D2s_v3',
+        'cores': 2,
+        'memory': 8,
+        'disks': 4
+    },
+    {
+        'name': 'Standard_D4s_v3',
+        'cores': 4,
+        'memory': 16,
+        'disks': 8
+    },
+    {
+        'name': 'Standard_D8s_v3',
+        'cores': 8,
+        'memory': 32,
+        'disks': 16
+    },
+    {
+        'name': 'Standard_E2s_v3',
+        'cores': 2,
+        'memory': 16,
+        'disks': 4
+    },
+    {
+        'name': 'Standard_E4s_v3',
+        'cores': 4,
+        'memory': 32,
+        'disks': 8
+    },
+    {
+        'name': 'Standard_F2s_v2',
+        'cores': 2,
+        'memory': 4,
+        'disks': 4
+    },
+    {
+        'name': 'Standard_F4s_v2',
+        'cores': 4,
+        'memory': 8,
+        'disks': 8
+    },
+    {
+        'name': 'Standard_B4ms',
+        'cores': 4,
+        'memory': 16,
+        'disks': 8
+    },
+    {
+        'name': 'Standard_B8ms',
+        'cores': 8,
+        'memory': 32,
+        'disks': 16
+    }
+]
 
-def list_common_vm_sizes(credential, subscription_id, location):
-    # Define most common VM sizes
-    common_sizes = [
-        {
-            'name': 'Standard_B1s',
-            'cores': 1,
-            'memory': 1,
-            'disks': 2
-        },
-        {
-            'name': 'Standard_B2s',
-            'cores': 2,
-            'memory': 4,
-            'disks': 4
-        },
-        {
-            'name': 'Standard_D2s_v3',
-            'cores': 2,
-            'memory': 8,
-            'disks': 4
-        },
-        {
-            'name': 'Standard_D4s_v3',
-            'cores': 4,
-            'memory': 16,
-            'disks': 8
-        },
-        {
-            'name': 'Standard_D8s_v3',
-            'cores': 8,
-            'memory': 32,
-            'disks': 16
-        },
-        {
-            'name': 'Standard_E2s_v3',
-            'cores': 2,
-            'memory': 16,
-            'disks': 4
-        },
-        {
-            'name': 'Standard_E4s_v3',
-            'cores': 4,
-            'memory': 32,
-            'disks': 8
-        },
-        {
-            'name': 'Standard_F2s_v2',
-            'cores': 2,
-            'memory': 4,
-            'disks': 4
-        },
-        {
-            'name': 'Standard_F4s_v2',
-            'cores': 4,
-            'memory': 8,
-            'disks': 8
-        },
-        {
-            'name': 'Standard_B4ms',
-            'cores': 4,
-            'memory': 16,
-            'disks': 8
-        },
-        {
-            'name': 'Standard_B8ms',
-            'cores': 8,
-            'memory': 32,
-            'disks': 16
-        }
-    ]
+# list_common_vm_sizes(): no index was passed in, so load one
+_LOAD_INDEX = object()
+
+def load_size_index(credential, subscription_id, locations):
+    try:
+        return SizeIndex.load(credential, subscription_id, locations)
+    except Exception as e:
+        print(f"Could not load the live VM size catalog: {e}")
+        return None
+
+def print_vm_sizes(title, sizes):
+    headers = ["Option", "Size", "vCPUs", "Memory (GB)", "Max Data Disks", "Accel. Networking", "Ephemeral OS", "Zones"]
+    rows = []
+
+    for idx, size in enumerate(sizes, 1):
+        rows.append([
+            str(idx),
+            size['name'],
+            size['vcpus'],
+            size['memory_gb'],
+            size['max_data_disks'],
+            "Yes" if size['accelerated_networking'] else "No",
+            "Yes" if size['ephemeral_os_disk'] else "No",
+            ",".join(size['zones']) or "-"
+        ])
+
+    print(f"\n{title}:")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    return {str(idx): size['name'] for idx, size in enumerate(sizes, 1)}
+
+def list_common_vm_sizes(credential, subscription_id, locations, size_index=_LOAD_INDEX):
+    # size_index=None means the catalog already failed to load: don't retry
+    if size_index is _LOAD_INDEX:
+        size_index = load_size_index(credential, subscription_id, locations)
+    if size_index is not None:
+        # Live capabilities of the common sizes offered in every selected region
+        sizes = size_index.find(locations, names={size['name'] for size in COMMON_VM_SIZES})
+        return print_vm_sizes("Common VM Sizes (available in all selected regions)", sizes)
+
+    common_sizes = COMMON_VM_SIZES
     
     headers = ["Option", "Size", "vCPUs", "Memory (GB)", "Max Data Disks"]
     rows = []
@@ -135,6 +190,10 @@ def list_common_vm_sizes(credential, subscription_id, location):
     print(tabulate(rows, headers=headers, tablefmt="grid"))
     return {str(idx): size['name'] for idx, size in enumerate(common_sizes, 1)}
 
+def list_vm_sizes(size_index, locations, min_vcpus=0, min_memory_gb=0):
+    sizes = size_index.find(locations, min_vcpus=min_vcpus, min_memory_gb=min_memory_gb)
+    return print_vm_sizes(f"VM Sizes with >= {min_vcpus} vCPUs and >= {min_memory_gb} GB (cheapest first)", sizes)
+
 def list_common_vm_images():
     # Define most common VM images
     common_images = [
@@ -227,8 +286,25 @@ def list_common_vm_images():
     print(tabulate(rows, headers=headers, tablefmt="grid"))
     return {str(idx): image for idx, image in enumerate(common_images, 1)}
 
+def list_vm_images(credential, subscription_id, location):
+    def show_progress(image):
+        print(f"  {image['publisher']} / {image['offer']} / {image['sku']}")
+
+    print(f"\nLoading marketplace images for {location}...")
+    images = get_image_index(credential, subscription_id, location, on_image=show_progress)
+
+    headers = ["Option", "Publisher", "Offer", "SKU"]
+    rows = []
+
+    for idx, image in enumerate(images, 1):
+        rows.append([str(idx), image['publisher'], image['offer'], image['sku']])
+
+    print(f"\nMarketplace VM Images ({location}):")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    return {str(idx): image for idx, image in enumerate(images, 1)}
+
 def list_resource_groups(credential, subscription_id):
-    resource_client = ResourceManagementClient(credential, subscription_id)
+    resource_client = get_client(ResourceManagementClient, credential, subscription_id)
     resource_groups = list(resource_client.resource_groups.list())
     
     headers = ["Option", "Name", "Location", "Provisioning State"]
@@ -242,7 +318,7 @@ def list_resource_groups(credential, subscription_id):
     return {str(idx): rg.name for idx, rg in enumerate(resource_groups, 1)}
 
 def list_virtual_machines(credential, subscription_id):
-    compute_client = ComputeManagementClient(credential, subscription_id)
+    compute_client = get_client(ComputeManagementClient, credential, subscription_id)
     vms = list(compute_client.virtual_machines.list_all())
     
     headers = ["Name", "Resource Group", "Location", "Size", "State"]
@@ -260,80 +336,33 @@ def list_virtual_machines(credential, subscription_id):
     print("\nExisting Virtual Machines:")
     print(tabulate(rows, headers=headers, tablefmt="grid"))
 
-def create_infrastructure(
-    credential,
-    subscription_id,
-    resource_group_name,
-    location,
-    vm_name,
-    vm_size,
-    vm_image
-):
-    import datetime
-
-    resource_client = ResourceManagementClient(credential, subscription_id)
-    network_client = NetworkManagementClient(credential, subscription_id)
-    compute_client = ComputeManagementClient(credential, subscription_id)
-
-    computer_name = validate_vm_name(vm_name)
-
-    print(f"Creating Resource Group '{resource_group_name}'...")
-    resource_client.resource_groups.create_or_update(
-        resource_group_name,
-        {"location": location}
-    )
-
-    vnet_name = f"{vm_name}-vnet"
-    subnet_name = f"{vm_name}-subnet"
-    ip_name = f"{vm_name}-ip"
-    nic_name = f"{vm_name}-nic"
-
-    print("Creating VNet and Subnet...")
-    network_client.virtual_networks.begin_create_or_update(
-        resource_group_name,
-        vnet_name,
-        {
-            'location': location,
-            'address_space': {'address_prefixes': ['10.0.0.0/16']},
-            'subnets': [{'name': subnet_name, 'address_prefix': '10.0.0.0/24'}]
-        }
-    ).result()
-
-    subnet = network_client.subnets.get(resource_group_name, vnet_name, subnet_name)
-
-    print("Creating Public IP...")
-    public_ip = network_client.public_ip_addresses.begin_create_or_update(
-        resource_group_name,
-        ip_name,
-        {
-            'location': location,
-            'sku': {'name': 'Basic'},
-            'public_ip_allocation_method': 'Dynamic',
-            'public_ip_address_version': 'IPV4'
-        }
-    ).result()
-
-    print("Creating Network Interface...")
-    nic = network_client.network_interfaces.begin_create_or_update(
-        resource_group_name,
-        nic_name,
-        {
-            'location': location,
-            'ip_configurations': [{
-                'name': 'ipconfig1',
-                'subnet': {'id': subnet.id},
-                'public_ip_address': {'id': public_ip.id}
-            }]
-        }
-    ).result()
+def vnet_parameters(location, subnet_name):
+    return {
+        'location': location,
+        'address_space': {'address_prefixes': ['10.0.0.0/16']},
+        'subnets': [{'name': subnet_name, 'address_prefix': '10.0.0.0/24'}]
+    }
 
-    print(f"Creating VM '{vm_name}'...")
+def public_ip_parameters(location):
+    return {
+        'location': location,
+        'sku': {'name': 'Basic'},
+        'public_ip_allocation_method': 'Dynamic',
+        'public_ip_address_version': 'IPV4'
+    }
 
-    # Start timing the deployment
-    start_time = datetime.datetime.utcnow()
-    print(f"Start Time (UTC): {start_time.isoformat()}")
+def nic_parameters(location, subnet_id, public_ip_id):
+    return {
+        'location': location,
+        'ip_configurations': [{
+            'name': 'ipconfig1',
+            'subnet': {'id': subnet_id},
+            'public_ip_address': {'id': public_ip_id}
+        }]
+    }
 
-    vm_parameters = {
+def vm_parameters(location, vm_name, vm_size, vm_image, nic_id):
+    return {
         'location': location,
         'hardware_profile': {'vm_size': vm_size},
         'storage_profile': {
@@ -351,76 +380,429 @@ def create_infrastructure(
             }
         },
         'os_profile': {
-            'computer_name': computer_name,
+            'computer_name': validate_vm_name(vm_name),
             'admin_username': 'azureuser',
             'admin_password': 'Password123!'  # Use secure handling in prod
         },
         'network_profile': {
-            'network_interfaces': [{'id': nic.id}]
+            'network_interfaces': [{'id': nic_id}]
         }
     }
 
-    compute_client.virtual_machines.begin_create_or_update(
-        resource_group_name,
-        vm_name,
-        vm_parameters
-    ).result()
+def create_infrastructure(
+    credential,
+    subscription_id,
+    resource_group_name,
+    location,
+    vm_name,
+    vm_size,
+    vm_image,
+    server_timestamps=False,
+    lro_history=None,
+    trial=None,
+    checkpoint=None,
+    cancel=None,
+    nic=None,
+    start_barrier=None,
+    save_log=True
+):
+    import datetime
+
+    resource_client = get_client(ResourceManagementClient, credential, subscription_id)
+    network_client = get_client(NetworkManagementClient, credential, subscription_id)
+    compute_client = get_client(ComputeManagementClient, credential, subscription_id)
+
+    vnet_name = f"{vm_name}-vnet"
+    subnet_name = f"{vm_name}-subnet"
+    ip_name = f"{vm_name}-ip"
+    nic_name = f"{vm_name}-nic"
+
+    timer = PhaseTimer(
+        server_timestamps=server_timestamps,
+        expected=expected_for(lro_history, location, vm_size),
+        checkpoint=checkpoint,
+        cancel=cancel
+    )
+
+    def create_resource_group():
+        print(f"[{location}] Creating Resource Group '{resource_group_name}'...")
+        return timer.call(
+            "resource_group",
+            resource_client.resource_groups.create_or_update,
+            resource_group_name,
+            {"location": location}
+        )
+
+    def create_vnet(resource_group):
+        print(f"[{location}] Creating VNet and Subnet...")
+        return timer.lro(
+            "vnet",
+            network_client.virtual_networks.begin_create_or_update,
+            resource_group_name,
+            vnet_name,
+            vnet_parameters(location, subnet_name)
+        )
+
+    def get_subnet(vnet):
+        return timer.call("subnet", network_client.subnets.get, resource_group_name, vnet_name, subnet_name)
+
+    def create_public_ip(resource_group):
+        print(f"[{location}] Creating Public IP...")
+        return timer.lro(
+            "public_ip",
+            network_client.public_ip_addresses.begin_create_or_update,
+            resource_group_name,
+            ip_name,
+            public_ip_parameters(location)
+        )
 
-    # End timing the deployment
-    end_time = datetime.datetime.utcnow()
-    duration = end_time - start_time
+    def create_nic(subnet, public_ip):
+        print(f"[{location}] Creating Network Interface...")
+        return timer.lro(
+            "nic",
+            network_client.network_interfaces.begin_create_or_update,
+            resource_group_name,
+            nic_name,
+            nic_parameters(location, subnet.id, public_ip.id)
+        )
 
-    print(f"End Time (UTC): {end_time.isoformat()}")
-    print(f"Deployment Duration: {duration.total_seconds():.2f} seconds")
+    release = {}
 
-    # Log the deployment
-    log_deployment_time(vm_name, location, start_time, end_time, duration)
+    def create_vm(nic):
+        if start_barrier is not None:
+            # Hold the VM create until every region's network is ready
+            print(f"[{location}] Network ready, waiting for the other regions...")
+            release["skew"] = round(start_barrier.wait(location), 6)
 
-    print(f"\nVM '{vm_name}' has been successfully created!")
+        print(f"[{location}] Creating VM '{vm_name}'...")
 
-def log_deployment_time(vm_name, location, start_time, end_time, duration):
+        # Start timing the deployment
+        start_time = datetime.datetime.utcnow()
+        print(f"[{location}] Start Time (UTC): {start_time.isoformat()}")
+
+        timer.lro(
+            "vm",
+            compute_client.virtual_machines.begin_create_or_update,
+            resource_group_name,
+            vm_name,
+            vm_parameters(location, vm_name, vm_size, vm_image, nic.id)
+        )
+        return start_time
+
+    graph = ResourceGraph()
+    graph.add("resource_group", create_resource_group)
+    if nic is not None:
+        # NIC leased from a warm network pool: only the VM is created
+        print(f"[{location}] Using pooled Network Interface '{nic.name}'")
+        graph.add("vm", lambda resource_group: create_vm(nic), depends_on=["resource_group"])
+    else:
+        # VNet and Public IP only need the resource group, so they run side by side
+        graph.add("vnet", create_vnet, depends_on=["resource_group"])
+        graph.add("subnet", get_subnet, depends_on=["vnet"])
+        graph.add("public_ip", create_public_ip, depends_on=["resource_group"])
+        graph.add("nic", create_nic, depends_on=["subnet", "public_ip"])
+        graph.add("vm", create_vm, depends_on=["nic"])
+    start_time = graph.run(cancel=cancel)["vm"]
+
+    # End timing the deployment (VM phase, measured on the monotonic clock).
+    # Time the ARM governor held our own requests back is not Azure's time.
+    end_time = start_time + datetime.timedelta(seconds=timer.total("vm"))
+    duration = datetime.timedelta(seconds=timer.total("vm") - timer.governor_wait("vm"))
+
+    print(f"[{location}] End Time (UTC): {end_time.isoformat()}")
+    print(f"[{location}] Deployment Duration: {duration.total_seconds():.2f} seconds")
+    total_seconds = timer.elapsed()
+    print(f"[{location}] Total Infrastructure Time: {total_seconds:.2f} seconds")
+
+    server_seconds = timer.server_seconds("vm")
+    if server_seconds is not None:
+        print(f"[{location}] Server-side VM Duration: {server_seconds:.2f} seconds")
+
+    # Log the deployment. A journaled trial is marked done as soon as this
+    # returns, so its record has to be written first.
+    log_entry = log_deployment_time(vm_name, location, start_time, end_time, duration,
+                        phases=timer.phases, total_seconds=total_seconds,
+                        server_duration=server_seconds, vm_size=vm_size, trial=trial,
+                        resumed=timer.resumed, governor_wait=timer.governor_wait(),
+                        throttles=timer.throttles(), release_skew=release.get("skew"),
+                        image=image_label(vm_image), save=save_log,
+                        durable=checkpoint is not None)
+
+    print(f"\n[{location}] VM '{vm_name}' has been successfully created!")
+    return log_entry
+
+def log_deployment_time(vm_name, location, start_time, end_time, duration, phases=None, total_seconds=None,
+                        server_duration=None, vm_size=None, trial=None, resumed=False,
+                        governor_wait=None, throttles=None, release_skew=None, image=None, save=True,
+                        durable=False):
     log_entry = {
         "vm_name": vm_name,
         "location": location,
+        "vm_size": vm_size,
+        "image": image,
+        "trial": trial,
+        "status": "succeeded",
         "start_time_utc": start_time.isoformat(),
         "end_time_utc": end_time.isoformat(),
         "duration_seconds": duration.total_seconds()
     }
-
-    log_file = "deployment_log.json"
-    if os.path.exists(log_file):
-        with open(log_file, "r") as f:
-            data = json.load(f)
+    if governor_wait is not None:
+        # Excluded from duration_seconds; kept for throttling analysis
+        log_entry["governor_wait_seconds"] = governor_wait
+        log_entry["throttle_count"] = throttles
+    if release_skew is not None:
+        # Synchronized start: how long after the barrier opened this VM create began
+        log_entry["release_skew_seconds"] = release_skew
+    if resumed:
+        # Re-attached to an LRO after a restart; the timings are partial
+        log_entry["resumed"] = True
+    if server_duration is not None:
+        # duration_seconds is the client view (includes poll interval);
+        # server_duration_seconds is Azure's own start -> end
+        log_entry["client_duration_seconds"] = duration.total_seconds()
+        log_entry["server_duration_seconds"] = server_duration
+    if phases is not None:
+        log_entry["total_seconds"] = total_seconds
+        log_entry["phases"] = {phase: phases[phase] for phase in PHASES if phase in phases}
+    if save:
+        append_deployment_log(log_entry, durable=durable)
+    return log_entry
+
+def log_deployment_failure(vm_name, location, error, trial=None, vm_size=None, image=None):
+    log_entry = {
+        "vm_name": vm_name,
+        "location": location,
+        "vm_size": vm_size,
+        "image": image,
+        "trial": trial,
+        "status": "failed",
+        "error": str(error)
+    }
+    append_deployment_log(log_entry)
+
+def append_deployment_log(log_entry, durable=False):
+    """
+    Hands the record to the results writer. With durable (or --fsync-logs)
+    this waits until it is written and raises if the write failed;
+    otherwise it returns the writer's Future without waiting.
+    """
+    writer = get_writer()
+    pending = writer.submit("deployment", log_entry)
+    if durable or writer.fsync_deployments:
+        pending.result()
+        print(f"Deployment log saved to '{DEPLOYMENT_LOG}' 📝")
     else:
-        data = []
+        print(f"Deployment log queued for '{DEPLOYMENT_LOG}' 📝")
+    return pending
+
+def deploy_region(credential, subscription_id, region, vm_config):
+    try:
+        entries, errors = run_trials(credential, subscription_id, region, vm_config)
+    finally:
+        # A teardown error ends this region early; don't hold the others at later barriers
+        for barrier in vm_config.get('start_barriers', {}).values():
+            barrier.withdraw(region)
+    if errors:
+        trials = vm_config.get('trials', 1)
+        if trials == 1:
+            raise errors[0]
+        raise RuntimeError(f"{len(errors)}/{trials} trials failed, last error: {errors[-1]}")
+    return entries
+
+def run_trials(credential, subscription_id, region, vm_config):
+    """
+    Runs vm_config['trials'] deployments in one region, tearing down the
+    resource group in between. The last trial's VM is kept unless
+    vm_config['teardown'] is set. Returns (log entries, errors).
+
+    With vm_config['network_pool'] (a network_pool.NetworkPool), each
+    trial leases a NIC from the pool and only creates the VM; the NIC is
+    released once the trial's resource group is torn down.
+
+    With vm_config['start_barriers'] ({trial: StartBarrier}), each
+    trial's VM create waits for the other regions' networks.
+    """
+    region_rg_name = f"{vm_config['resource_group_name']}-{region}"
+    region_vm_name = f"{vm_config['vm_name']}-{region}"
+
+    trials = vm_config.get('trials', 1)
+    journal = vm_config.get('journal')
+    pool = vm_config.get('network_pool')
+    barriers = vm_config.get('start_barriers', {})
+    entries = []
+    errors = []
+
+    for trial in range(1, trials + 1):
+        if journal is not None and journal.is_trial_done(region_rg_name, trial):
+            print(f"[{region}] Trial {trial} of '{region_rg_name}' already completed, skipping.")
+            if trial in barriers:
+                barriers[trial].withdraw(region)
+            continue
+
+        print(f"\nDeploying to region: {region}" + (f" (trial {trial}/{trials})" if trials > 1 else ""))
+        nic = None
+        try:
+            nic = pool.lease(region) if pool is not None else None
+            entries.append(create_infrastructure(
+                credential=credential,
+                subscription_id=subscription_id,
+                resource_group_name=region_rg_name,
+                location=region,
+                vm_name=region_vm_name,
+                vm_size=vm_config['vm_size'],
+                vm_image=vm_config['vm_image'],
+                server_timestamps=vm_config.get('server_timestamps', False),
+                lro_history=vm_config.get('lro_history'),
+                trial=trial,
+                checkpoint=journal.checkpoint(region_rg_name, trial) if journal is not None else None,
+                nic=nic,
+                start_barrier=barriers.get(trial)
+            ))
+            if journal is not None:
+                journal.trial_done(region_rg_name, trial)
+        except Exception as e:
+            print(f"[{region}] Deployment failed: {e}")
+            log_deployment_failure(region_vm_name, region, e, trial=trial,
+                                   vm_size=vm_config['vm_size'], image=image_label(vm_config['vm_image']))
+            errors.append(e)
+
+        # Never hold the other regions at the barrier for a failed trial
+        if trial in barriers:
+            barriers[trial].withdraw(region)
+
+        # Tear down between trials; the last trial's VM is left running
+        if trial < trials or vm_config.get('teardown', False):
+            teardown_resource_group(credential, subscription_id, region_rg_name, region)
+            if nic is not None:
+                pool.release(region, nic)
+
+    return entries, errors
+
+def teardown_resource_group(credential, subscription_id, resource_group_name, location):
+    resource_client = get_client(ResourceManagementClient, credential, subscription_id)
+    print(f"[{location}] Tearing down Resource Group '{resource_group_name}'...")
+    try:
+        resource_client.resource_groups.begin_delete(resource_group_name).result()
+    except ResourceNotFoundError:
+        pass
+
+def deploy_to_regions(credential, subscription_id, regions, vm_config, max_workers=None):
+    """
+    Deploys to all regions concurrently, at most max_workers at a time
+    (default: one worker per region). A failure in one region does not
+    affect the others. Returns a dict of region -> error (None on success).
+
+    With vm_config['synchronized_start'], every region creates its
+    network first and the VM creates are released together per trial
+    (this needs one worker per region).
+    """
+    if max_workers is None:
+        max_workers = len(regions)
+    max_workers = max(1, min(max_workers, len(regions)))
+
+    if vm_config.get('synchronized_start'):
+        max_workers = len(regions)
+        barriers = {trial: StartBarrier(len(regions)) for trial in range(1, vm_config.get('trials', 1) + 1)}
+        vm_config = dict(vm_config, start_barriers=barriers)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deploy") as executor:
+        futures = {
+            executor.submit(deploy_region, credential, subscription_id, region, vm_config): region
+            for region in regions
+        }
+        for future in as_completed(futures):
+            region = futures[future]
+            try:
+                future.result()
+                results[region] = None
+            except Exception as e:
+                results[region] = str(e)
+
+    print_deployment_summary(regions, results)
+    for trial, barrier in vm_config.get('start_barriers', {}).items():
+        if barrier.max_skew() is not None:
+            print(f"Trial {trial}: VM creates released within {barrier.max_skew() * 1000:.1f} ms of each other")
+    return results
+
+def print_deployment_summary(regions, results):
+    headers = ["Region", "Status", "Error"]
+    rows = [[region, "Failed" if results[region] else "Succeeded", results[region] or ""] for region in regions]
+    print("\nDeployment Summary:")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
 
-    data.append(log_entry)
+def plot_deployment_log(run_id=None, output_file="output.png"):
+    """
+    Plots each VM's deployment time in a run (default: the current run)
+    as a bar stacked by phase (RG, VNet, subnet, Public IP, NIC, VM).
+    Entries without phase data are drawn as a single VM-create bar.
+    """
+    import matplotlib.pyplot as plt
 
-    with open(log_file, "w") as f:
-        json.dump(data, f, indent=4)
+    get_writer().flush()
+    store = get_store()
+    logs = store.deployments(run_id=run_id or store.run_id, status="succeeded")
+    if not logs:
+        print("No successful deployments to plot.")
+        return
+    vm_names = [entry['vm_name'] for entry in logs]
+
+    plt.figure(figsize=(10, 6))
+    bottoms = [0.0] * len(logs)
+    for phase in PHASES:
+        heights = []
+        for entry in logs:
+            phases = entry.get('phases')
+            if phases is None:
+                heights.append(entry['duration_seconds'] if phase == "vm" else 0.0)
+            else:
+                heights.append(phases.get(phase, {}).get('total_seconds', 0.0))
+        if not any(heights):
+            continue
+        plt.bar(vm_names, heights, bottom=bottoms, label=phase)
+        bottoms = [b + h for b, h in zip(bottoms, heights)]
+
+    plt.title('VM Deployment Duration Comparison by Region', fontsize=14)
+    plt.xlabel('VM Name', fontsize=12)
+    plt.ylabel('Deployment Duration (seconds, sum of phases)', fontsize=12)
+    plt.xticks(rotation=45, ha='right')
+    plt.legend(title='Phase')
+    plt.tight_layout()
+    #plt.show()
+    plt.savefig(output_file)
+
+def load_lro_history(days=HISTORY_DAYS):
+    return expected_durations(get_store().deployments(status="succeeded", days=days))
+
+def plot_trial_statistics(run_id=None, output_file="output.png"):
+    get_writer().flush()
+    store = get_store()
+    stats = summarize_trials(trial_samples(store.deployments(run_id=run_id or store.run_id)))
+    if not stats:
+        print("No successful trials to summarize.")
+        return
 
-    print(f"Deployment log saved to '{log_file}' 📝")
+    print_trial_summary(stats)
+    plot_trial_summary(stats, output_file)
 
-def deploy_to_regions(credential, subscription_id, regions, vm_config):
-    for region in regions:
-        region_rg_name = f"{vm_config['resource_group_name']}-{region}"
-        region_vm_name = f"{vm_config['vm_name']}-{region}"
-        
-        print(f"\nDeploying to region: {region}")
-        create_infrastructure(
-            credential=credential,
-            subscription_id=subscription_id,
-            resource_group_name=region_rg_name,
-            location=region,
-            vm_name=region_vm_name,
-            vm_size=vm_config['vm_size'],
-            vm_image=vm_config['vm_image']
-        )
+def parse_args():
+    parser = argparse.ArgumentParser(description="Azure Multi-Region VM Deployment Script")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="resume an interrupted run from its journal in runs/")
+    parser.add_argument("--fsync-logs", action="store_true",
+                        help="fsync every deployment log record (slower, survives power loss)")
+    return parser.parse_args()
 
 def main():
-        # Clear previous logs (optional)
-    if os.path.exists("deployment_log.json"):
-        os.remove("deployment_log.json")
+    args = parse_args()
+    # Set on the shared writer, so every engine's module sees it
+    get_writer().fsync_deployments = args.fsync_logs
+    if args.resume:
+        resume_run(args.resume)
+        return
+
+    # Recent runs' phase timings seed the adaptive LRO pollers
+    lro_history = load_lro_history()
 
     print("Azure Multi-Region VM Deployment Script")
     print("=" * 40)
@@ -450,20 +832,6 @@ def main():
         print("No regions available.")
         return
         
-    vm_sizes_dict = list_common_vm_sizes(credential, subscription_id, list(regions_dict.values())[0])
-    vm_size_choice = input("\nSelect VM size (enter number): ")
-    vm_size = vm_sizes_dict.get(vm_size_choice)
-    if not vm_size:
-        print("Invalid VM size selection.")
-        return
-
-    vm_images_dict = list_common_vm_images()
-    vm_image_choice = input("\nSelect VM image (enter number): ")
-    vm_image = vm_images_dict.get(vm_image_choice)
-    if not vm_image:
-        print("Invalid VM image selection.")
-        return
-
     print("\nSelect regions (comma-separated numbers, e.g., 1,2,3): ")
     region_choices = input().split(',')
     selected_regions = [regions_dict.get(choice.strip()) for choice in region_choices]
@@ -473,41 +841,152 @@ def main():
         print("No valid regions selected.")
         return
 
+    size_index = load_size_index(credential, subscription_id, selected_regions)
+    min_vcpus = input("\nMinimum vCPUs to search the full size catalog (blank for common sizes): ").strip()
+    if min_vcpus.isdigit() and size_index is not None:
+        min_memory = input("Minimum memory in GB (default 0): ").strip()
+        vm_sizes_dict = list_vm_sizes(size_index, selected_regions, int(min_vcpus),
+                                      float(min_memory) if min_memory.replace('.', '', 1).isdigit() else 0)
+    else:
+        vm_sizes_dict = list_common_vm_sizes(credential, subscription_id, selected_regions, size_index)
+    vm_size_choices = input("\nSelect VM size(s) (enter number, comma-separated for a matrix run): ").split(',')
+    vm_sizes = [vm_sizes_dict.get(choice.strip()) for choice in vm_size_choices]
+    vm_sizes = [s for s in vm_sizes if s]
+    if not vm_sizes:
+        print("Invalid VM size selection.")
+        return
+    vm_size = vm_sizes[0]
+
+    catalog_choice = input("\nBrowse the full marketplace image catalog instead of common images? (y/N): ").strip().lower()
+    if catalog_choice == "y":
+        vm_images_dict = list_vm_images(credential, subscription_id, selected_regions[0])
+    else:
+        vm_images_dict = list_common_vm_images()
+    vm_image_choices = input("\nSelect VM image(s) (enter number, comma-separated for a matrix run): ").split(',')
+    vm_images = [vm_images_dict.get(choice.strip()) for choice in vm_image_choices]
+    vm_images = [i for i in vm_images if i]
+    if not vm_images:
+        print("Invalid VM image selection.")
+        return
+    vm_image = vm_images[0]
+
+    workers_choice = input(f"\nMax deployments in parallel (default {len(selected_regions)}, 1 = sequential): ").strip()
+    max_workers = int(workers_choice) if workers_choice.isdigit() and int(workers_choice) > 0 else None
+
+    server_choice = input("Collect server-side operation timestamps? (y/N): ").strip().lower()
+
     vm_config = {
         'vm_name': vm_name_base,
         'resource_group_name': resource_group_base,
         'vm_size': vm_size,
-        'vm_image': vm_image
+        'vm_image': vm_image,
+        'server_timestamps': server_choice == "y",
+        'trials': 1
     }
 
-    deploy_to_regions(credential, subscription_id, selected_regions, vm_config)
+    engine = "threads"
+    if len(vm_sizes) * len(vm_images) == 1:
+        engine_choice = input("Use the asyncio deployment engine? (y/N): ").strip().lower()
+        if engine_choice == "y":
+            engine = "asyncio"
+        elif len(selected_regions) > 1:
+            hedge_choice = input("Hedged mode: race the regions and keep only the first VM to finish? (y/N): ").strip().lower()
+            if hedge_choice == "y":
+                engine = "hedged"
+
+    # A hedged run keeps a single VM, so it has no repeated trials
+    if engine != "hedged":
+        trials_choice = input("Trials per region (deploy, tear down, repeat; default 1): ").strip()
+        vm_config['trials'] = int(trials_choice) if trials_choice.isdigit() and int(trials_choice) > 0 else 1
+
+    if engine == "threads":
+        pool_choice = input("Lease NICs from a warm network pool so only the VM create runs? (y/N): ").strip().lower()
+        vm_config['warm_pool'] = pool_choice == "y"
+        if len(selected_regions) > 1:
+            sync_choice = input("Synchronize VM creates (networks first, then every region's VM at once)? (y/N): ").strip().lower()
+            vm_config['synchronized_start'] = sync_choice == "y"
+
+    # Check quotas and SKU availability before anything is created
+    invalid = run_preflight(credential, subscription_id, selected_regions, vm_sizes)
+    if len(vm_sizes) * len(vm_images) == 1:
+        selected_regions = [r for r in selected_regions if (r, vm_size) not in invalid]
+        if not selected_regions:
+            print("No selected region passed the pre-flight check.")
+            return
+    excluded = [[region, size, reason] for (region, size), reason in invalid.items()]
+
+    journal = RunJournal(new_run_id())
+    journal.start({
+        'subscription_id': subscription_id,
+        'regions': selected_regions,
+        'vm_sizes': vm_sizes,
+        'vm_images': vm_images,
+        'max_workers': max_workers,
+        'engine': engine,
+        'excluded': excluded,
+        'vm_config': vm_config
+    })
+    get_store().start_run(journal.run_id, "deployment", journal.config)
+    print(f"\nRun ID: {journal.run_id} (resume with: python3 DeployVM.py --resume {journal.run_id})")
+
+    execute_run(credential, journal, lro_history)
+
+def execute_run(credential, journal, lro_history):
+    """
+    Runs (or resumes) the deployment described by the journal's saved
+    configuration. Trials the journal already marks as done are skipped.
+    """
+    config = journal.config
+    subscription_id = config['subscription_id']
+    regions = config['regions']
+    max_workers = config['max_workers']
+    vm_config = dict(config['vm_config'], lro_history=lro_history, journal=journal)
+
+    if vm_config.get('warm_pool'):
+        from network_pool import NetworkPool
+        vm_config['network_pool'] = NetworkPool(credential, subscription_id)
+        vm_config['network_pool'].prepare(regions)
+
+    if len(config['vm_sizes']) * len(config['vm_images']) > 1:
+        # Several sizes/images: run every region x size x image cell
+        from benchmark_matrix import run_matrix
+        excluded = {(region, size): reason for region, size, reason in config.get('excluded', [])}
+        run_matrix(credential, subscription_id, regions, config['vm_sizes'], config['vm_images'], vm_config,
+                   max_workers=max_workers, excluded=excluded)
+        print("\nMatrix deployment completed!")
+        return
 
-        # After deployment, plot the results
-    import matplotlib.pyplot as plt
+    if config['engine'] == "hedged":
+        # Race the regions; only the winner's VM is kept
+        from hedged import run_hedged
+        run_hedged(credential, subscription_id, regions, vm_config)
+        plot_deployment_log()
+        print("\nHedged deployment completed!")
+        return
 
-    log_file = "deployment_log.json"
-    if not os.path.exists(log_file):
-        print(f"Error: The file '{log_file}' was not found.")
+    if config['engine'] == "asyncio":
+        from DeployVMAsync import run_async_deployment
+        run_async_deployment(subscription_id, regions, vm_config, max_concurrency=max_workers)
     else:
-        with open(log_file, 'r') as f:
-            logs = json.load(f)
+        deploy_to_regions(credential, subscription_id, regions, vm_config, max_workers=max_workers)
 
-        vm_names = [entry['vm_name'] for entry in logs]
-        durations = [entry['duration_seconds'] for entry in logs]
+    # After deployment, plot the results
+    if vm_config['trials'] > 1:
+        plot_trial_statistics()
+    else:
+        plot_deployment_log()
 
-        plt.figure(figsize=(10, 6))
-        plt.bar(vm_names, durations, color='skyblue')
-        plt.title('VM Deployment Duration Comparison by Region', fontsize=14)
-        plt.xlabel('VM Name', fontsize=12)
-        plt.ylabel('Deployment Duration (seconds)', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        #plt.show()
-        plt.savefig("output.png")
+    print("\nMulti-region deployment completed!")
 
+def resume_run(run_id):
+    journal = RunJournal(run_id)
+    if journal.config is None:
+        print(f"No journal found for run '{run_id}' in '{journal.path}'.")
+        return
 
-    
-    print("\nMulti-region deployment completed!")
+    print(f"Resuming run {run_id}...")
+    get_store().start_run(run_id, "deployment", journal.config)
+    execute_run(get_credentials(), journal, load_lro_history())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+import asyncio
+import datetime
+from azure.core.exceptions import ResourceNotFoundError
+from azure.identity.aio import AzureCliCredential
+from azure.mgmt.compute.aio import ComputeManagementClient
+from azure.mgmt.network.aio import NetworkManagementClient
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+from phase_timer import PhaseTimer
+from arm_governor import AsyncGovernorPolicy
+from lro_polling import expected_for
+from results_store import image_label
+from DeployVM import (
+    vnet_parameters,
+    public_ip_parameters,
+    nic_parameters,
+    vm_parameters,
+    log_deployment_time,
+    log_deployment_failure,
+    print_deployment_summary
+)
+
+async def create_infrastructure_async(
+    clients,
+    resource_group_name,
+    location,
+    vm_name,
+    vm_size,
+    vm_image,
+    server_timestamps=False,
+    lro_history=None,
+    trial=None,
+    checkpoint=None
+):
+    """
+    Async twin of DeployVM.create_infrastructure. Every LRO is awaited on
+    the running event loop, so many regions can be polled from one thread.
+    clients is a (resource, network, compute) tuple of aio management clients.
+    """
+    resource_client, network_client, compute_client = clients
+    timer = PhaseTimer(
+        server_timestamps=server_timestamps,
+        expected=expected_for(lro_history, location, vm_size),
+        checkpoint=checkpoint
+    )
+
+    print(f"[{location}] Creating Resource Group '{resource_group_name}'...")
+    await timer.call_async(
+        "resource_group",
+        resource_client.resource_groups.create_or_update,
+        resource_group_name,
+        {"location": location}
+    )
+
+    vnet_name = f"{vm_name}-vnet"
+    subnet_name = f"{vm_name}-subnet"
+    ip_name = f"{vm_name}-ip"
+    nic_name = f"{vm_name}-nic"
+
+    async def create_subnet():
+        print(f"[{location}] Creating VNet and Subnet...")
+        await timer.lro_async(
+            "vnet",
+            network_client.virtual_networks.begin_create_or_update,
+            resource_group_name,
+            vnet_name,
+            vnet_parameters(location, subnet_name)
+        )
+        return await timer.call_async("subnet", network_client.subnets.get, resource_group_name, vnet_name, subnet_name)
+
+    async def create_public_ip():
+        print(f"[{location}] Creating Public IP...")
+        return await timer.lro_async(
+            "public_ip",
+            network_client.public_ip_addresses.begin_create_or_update,
+            resource_group_name,
+            ip_name,
+            public_ip_parameters(location)
+        )
+
+    # VNet and Public IP only need the resource group, so they run side by side.
+    # Like ResourceGraph.run, let both finish before raising, so the caller
+    # never tears down the resource group under an LRO still in flight.
+    results = await asyncio.gather(create_subnet(), create_public_ip(), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    subnet, public_ip = results
+
+    print(f"[{location}] Creating Network Interface...")
+    nic = await timer.lro_async(
+        "nic",
+        network_client.network_interfaces.begin_create_or_update,
+        resource_group_name,
+        nic_name,
+        nic_parameters(location, subnet.id, public_ip.id)
+    )
+
+    print(f"[{location}] Creating VM '{vm_name}'...")
+
+    # Start timing the deployment
+    start_time = datetime.datetime.utcnow()
+    print(f"[{location}] Start Time (UTC): {start_time.isoformat()}")
+
+    await timer.lro_async(
+        "vm",
+        compute_client.virtual_machines.begin_create_or_update,
+        resource_group_name,
+        vm_name,
+        vm_parameters(location, vm_name, vm_size, vm_image, nic.id)
+    )
+
+    # End timing the deployment (VM phase, measured on the monotonic clock).
+    # Time the ARM governor held our own requests back is not Azure's time.
+    end_time = start_time + datetime.timedelta(seconds=timer.total("vm"))
+    duration = datetime.timedelta(seconds=timer.total("vm") - timer.governor_wait("vm"))
+
+    print(f"[{location}] End Time (UTC): {end_time.isoformat()}")
+    print(f"[{location}] Deployment Duration: {duration.total_seconds():.2f} seconds")
+    total_seconds = timer.elapsed()
+    print(f"[{location}] Total Infrastructure Time: {total_seconds:.2f} seconds")
+
+    server_seconds = timer.server_seconds("vm")
+    if server_seconds is not None:
+        print(f"[{location}] Server-side VM Duration: {server_seconds:.2f} seconds")
+
+    # File I/O stays off the event loop; a journaled trial's record is
+    # written before the trial is marked done
+    await asyncio.to_thread(log_deployment_time, vm_name, location, start_time, end_time, duration,
+                            phases=timer.phases, total_seconds=total_seconds,
+                            server_duration=server_seconds, vm_size=vm_size, trial=trial,
+                            resumed=timer.resumed, governor_wait=timer.governor_wait(),
+                            throttles=timer.throttles(), image=image_label(vm_image),
+                            durable=checkpoint is not None)
+
+    print(f"\n[{location}] VM '{vm_name}' has been successfully created!")
+
+async def teardown_resource_group_async(resource_client, resource_group_name, location):
+    print(f"[{location}] Tearing down Resource Group '{resource_group_name}'...")
+    try:
+        poller = await resource_client.resource_groups.begin_delete(resource_group_name)
+        await poller.result()
+    except ResourceNotFoundError:
+        pass
+
+async def deploy_to_regions_async(subscription_id, regions, vm_config, max_concurrency=None):
+    """
+    Deploys to all regions on a single event loop, at most max_concurrency
+    regions at a time (default: all). One set of clients is shared by every
+    region. Returns a dict of region -> error (None on success).
+
+    Requests are paced by the same process-wide ARM governor as the
+    threaded engine, through AsyncGovernorPolicy.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or max(1, len(regions)))
+    options = {"per_retry_policies": [AsyncGovernorPolicy()]}
+
+    async with AzureCliCredential() as credential, \
+            ResourceManagementClient(credential, subscription_id, **options) as resource_client, \
+            NetworkManagementClient(credential, subscription_id, **options) as network_client, \
+            ComputeManagementClient(credential, subscription_id, **options) as compute_client:
+        clients = (resource_client, network_client, compute_client)
+
+        async def deploy_region(region):
+            region_rg_name = f"{vm_config['resource_group_name']}-{region}"
+            region_vm_name = f"{vm_config['vm_name']}-{region}"
+
+            trials = vm_config.get('trials', 1)
+            journal = vm_config.get('journal')
+            errors = []
+
+            async with semaphore:
+                for trial in range(1, trials + 1):
+                    if journal is not None and journal.is_trial_done(region_rg_name, trial):
+                        print(f"[{region}] Trial {trial} of '{region_rg_name}' already completed, skipping.")
+                        continue
+
+                    print(f"\nDeploying to region: {region}" + (f" (trial {trial}/{trials})" if trials > 1 else ""))
+                    try:
+                        await create_infrastructure_async(
+                            clients,
+                            resource_group_name=region_rg_name,
+                            location=region,
+                            vm_name=region_vm_name,
+                            vm_size=vm_config['vm_size'],
+                            vm_image=vm_config['vm_image'],
+                            server_timestamps=vm_config.get('server_timestamps', False),
+                            lro_history=vm_config.get('lro_history'),
+                            trial=trial,
+                            checkpoint=journal.checkpoint(region_rg_name, trial) if journal is not None else None
+                        )
+                        if journal is not None:
+                            await asyncio.to_thread(journal.trial_done, region_rg_name, trial)
+                    except Exception as e:
+                        print(f"[{region}] Deployment failed: {e}")
+                        await asyncio.to_thread(log_deployment_failure, region_vm_name, region, e, trial=trial,
+                                                vm_size=vm_config['vm_size'], image=image_label(vm_config['vm_image']))
+                        errors.append(e)
+
+                    # Tear down between trials; the last trial's VM is left running.
+                    # A failed teardown ends this region only, as in the threaded engine.
+                    if trial < trials:
+                        try:
+                            await teardown_resource_group_async(resource_client, region_rg_name, region)
+                        except Exception as e:
+                            print(f"[{region}] Teardown failed, skipping the remaining trials: {e}")
+                            return f"Teardown after trial {trial} failed: {e}"
+
+            if not errors:
+                return None
+            if trials == 1:
+                return str(errors[0])
+            return f"{len(errors)}/{trials} trials failed, last error: {errors[-1]}"
+
+        errors = await asyncio.gather(*(deploy_region(region) for region in regions))
+
+    results = dict(zip(regions, errors))
+    print_deployment_summary(regions, results)
+    return results
+
+def run_async_deployment(subscription_id, regions, vm_config, max_concurrency=None):
+    return asyncio.run(deploy_to_regions_async(subscription_id, regions, vm_config, max_concurrency))
@@ -1,12 +1,14 @@
-import json
 import socket
 import time
-import os
-from azure.identity import AzureCliCredential
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.network import NetworkManagementClient
-from azure.mgmt.subscription import SubscriptionClient
 from tabulate import tabulate
+from azure_clients import get_client
+from azure_credentials import get_shared_credential
+from catalog_cache import cached_subscriptions
+from results_store import get_store
+from results_writer import get_writer
+from run_journal import new_run_id
 
 def measure_tcp_latency(ip, ports=[22, 3389], timeout=2):
     for port in ports:
@@ -28,40 +30,29 @@ def log_latency(vm_name, location, ip, port_used, latency_ms):
         "latency_ms": latency_ms
     }
 
-    log_file = "latency_log.json"
-    try:
-        with open(log_file, "r") as f:
-            data = json.load(f)
-    except:
-        data = []
-
-    data.append(entry)
-
-    with open(log_file, "w") as f:
-        json.dump(data, f, indent=4)
+    get_writer().submit("latency", entry)
 
     print(f"✅ {vm_name} @ {ip} (port {port_used}) latency: {latency_ms:.2f} ms")
 
 def main():
-    credential = AzureCliCredential()
+    credential = get_shared_credential()
 
     # Step 1: List subscriptions
-    sub_client = SubscriptionClient(credential)
-    subscriptions = list(sub_client.subscriptions.list())
+    subscriptions = cached_subscriptions(credential)
 
     print("\n📋 Available Subscriptions:")
-    sub_table = [[str(i+1), sub.subscription_id, sub.display_name, sub.state] for i, sub in enumerate(subscriptions)]
+    sub_table = [[str(i+1), sub['subscription_id'], sub['display_name'], sub['state']] for i, sub in enumerate(subscriptions)]
     print(tabulate(sub_table, headers=["#", "Subscription ID", "Name", "State"], tablefmt="grid"))
 
     sub_choice = input("\nEnter the number of the subscription to use: ").strip()
     try:
-        subscription_id = subscriptions[int(sub_choice)-1].subscription_id
+        subscription_id = subscriptions[int(sub_choice)-1]['subscription_id']
     except:
         print("❌ Invalid choice.")
         return
 
-    compute_client = ComputeManagementClient(credential, subscription_id)
-    network_client = NetworkManagementClient(credential, subscription_id)
+    compute_client = get_client(ComputeManagementClient, credential, subscription_id)
+    network_client = get_client(NetworkManagementClient, credential, subscription_id)
 
     print("\n🔍 Fetching all VMs in subscription...")
     vms = list(compute_client.virtual_machines.list_all())
@@ -86,13 +77,10 @@ def main():
     selected = input("\nEnter VM numbers to check latency (comma-separated, e.g., 1,3,4): ").split(",")
     selected = [int(i.strip()) - 1 for i in selected if i.strip().isdigit()]
 
-    # 💥 Clear or create fresh log file
-    log_file = "latency_log.json"
-    if os.path.exists(log_file):
-        os.remove(log_file)
-        print("🧹 Previous latency log found and wiped.")
-    else:
-        print("📂 No existing latency log found. Starting fresh.")
+    # 🗂️ Each measurement is its own run; earlier runs stay in the results store
+    run_id = new_run_id()
+    get_store().start_run(run_id, "latency")
+    print(f"🗂️ Latency run {run_id} (history kept in the results store)")
 
     print("")  # spacer
 
@@ -101,11 +89,11 @@ def main():
             vm = vms[i]
             vm_name = vm.name
             location = vm.location
-            rg = vm.id.split("/")[4]
 
+            # The NIC and IP may live outside the VM's resource group (warm network pool)
             nic_id = vm.network_profile.network_interfaces[0].id
             nic_name = nic_id.split("/")[-1]
-            nic = network_client.network_interfaces.get(rg, nic_name)
+            nic = network_client.network_interfaces.get(nic_id.split("/")[4], nic_name)
 
             ip_ref = nic.ip_configurations[0].public_ip_address
             if not ip_ref:
@@ -113,7 +101,7 @@ def main():
                 continue
 
             ip_name = ip_ref.id.split("/")[-1]
-            public_ip = network_client.public_ip_addresses.get(rg, ip_name)
+            public_ip = network_client.public_ip_addresses.get(ip_ref.id.split("/")[4], ip_name)
 
             ip = public_ip.ip_address
             if not ip:
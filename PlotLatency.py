@@ -1,16 +1,23 @@
-import json
+import argparse
 import matplotlib.pyplot as plt
-import os
+from results_store import get_store
 
-log_file = "latency_log.json"
 output_image = "latency_graph.png"
 
-if not os.path.exists(log_file):
-    print(f"❌ '{log_file}' not found. Run the latency measurement script first.")
-    exit()
+parser = argparse.ArgumentParser(description="Plot measured TCP latency from the results store")
+parser.add_argument("--region", help="only this region")
+parser.add_argument("--days", type=int, help="samples from the last N days instead of the latest run")
+args = parser.parse_args()
 
-with open(log_file) as f:
-    data = json.load(f)
+store = get_store()
+if args.days is not None:
+    data = store.latency_samples(location=args.region, days=args.days)
+else:
+    run_id = store.latest_run("latency")
+    if run_id is None:
+        print("❌ No latency runs found. Run the latency measurement script first.")
+        exit()
+    data = store.latency_samples(run_id=run_id, location=args.region)
 
 if not data:
     print("📭 No latency data to plot.")
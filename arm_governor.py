@@ -0,0 +1,201 @@
+import asyncio
+import contextvars
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from azure.core.pipeline.policies import AsyncHTTPPolicy, HTTPPolicy
+
+# Local token-bucket pacing per subscription (requests/second, burst size)
+READ_RATE = 20.0
+READ_BURST = 200
+WRITE_RATE = 5.0
+WRITE_BURST = 100
+# Below this many remaining ARM requests the bucket rate is scaled down
+LOW_REMAINING = 100
+MIN_RATE_FRACTION = 0.1
+# 429 handling: Retry-After (or exponential backoff) plus up to 50% jitter
+MAX_THROTTLE_RETRIES = 5
+BASE_BACKOFF_SECONDS = 2.0
+
+_SUBSCRIPTION_RE = re.compile(r"/subscriptions/([^/?]+)", re.IGNORECASE)
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until one is available. Returns the
+        number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self):
+        """Same as acquire(), but sleeps without blocking the event loop."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def observe_remaining(self, remaining):
+        """
+        Aligns the bucket with ARM's own count: never hold more tokens than
+        ARM says are left, and slow down as that count gets low.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, remaining)
+            fraction = min(1.0, max(MIN_RATE_FRACTION, remaining / LOW_REMAINING))
+            self.rate = self.base_rate * fraction
+
+class GovernorStats:
+    def __init__(self):
+        self.requests = 0
+        self.throttles = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, wait_seconds=0.0, throttled=False, request=False):
+        with self._lock:
+            self.wait_seconds += wait_seconds
+            self.throttles += int(throttled)
+            self.requests += int(request)
+
+class ArmGovernor:
+    """
+    Process-wide pacing of ARM requests. Each subscription has a read and
+    a write token bucket; GovernorPolicy (AsyncGovernorPolicy for the aio
+    clients) takes a token before every request attempt and feeds the
+    x-ms-ratelimit-remaining-* headers back.
+
+    Wait time and throttles are added to the process totals and to the
+    GovernorStats bound to the current thread or asyncio task (see
+    bind()), so callers can attribute governor delay to the phase that
+    incurred it.
+    """
+
+    def __init__(self):
+        self.totals = GovernorStats()
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = contextvars.ContextVar("governor_stats", default=None)
+
+    def bucket(self, subscription_id, kind):
+        key = (subscription_id, kind)
+        with self._lock:
+            if key not in self._buckets:
+                if kind == "reads":
+                    self._buckets[key] = TokenBucket(READ_RATE, READ_BURST)
+                else:
+                    self._buckets[key] = TokenBucket(WRITE_RATE, WRITE_BURST)
+            return self._buckets[key]
+
+    def current_stats(self):
+        return self._stats.get()
+
+    @contextmanager
+    def bind(self, stats):
+        token = self._stats.set(stats)
+        try:
+            yield stats
+        finally:
+            self._stats.reset(token)
+
+    def record(self, wait_seconds=0.0, throttled=False, request=False):
+        self.totals.add(wait_seconds, throttled, request)
+        stats = self.current_stats()
+        if stats is not None:
+            stats.add(wait_seconds, throttled, request)
+
+governor = ArmGovernor()
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def _request_bucket(http_request):
+    kind = "reads" if http_request.method in ("GET", "HEAD") else "writes"
+    match = _SUBSCRIPTION_RE.search(http_request.url)
+    return kind, governor.bucket(match.group(1).lower() if match else None, kind)
+
+def _throttle_delay(kind, bucket, http_response, attempt):
+    """
+    Feeds the rate-limit header back to the bucket. Returns how long to
+    back off before retrying, or None if the response should be returned.
+    """
+    remaining = http_response.headers.get(f"x-ms-ratelimit-remaining-subscription-{kind}")
+    if remaining is not None and remaining.isdigit():
+        bucket.observe_remaining(int(remaining))
+
+    if http_response.status_code != 429 or attempt == MAX_THROTTLE_RETRIES:
+        return None
+
+    delay = _retry_after(http_response) or BASE_BACKOFF_SECONDS * 2 ** attempt
+    delay += random.uniform(0, delay / 2)
+    governor.record(wait_seconds=delay, throttled=True)
+    return delay
+
+class GovernorPolicy(HTTPPolicy):
+    """
+    Per-retry pipeline policy that paces requests through the governor
+    and handles 429 Too Many Requests with jittered backoff before the
+    SDK's RetryPolicy would see it.
+    """
+
+    def send(self, request):
+        kind, bucket = _request_bucket(request.http_request)
+
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            governor.record(wait_seconds=bucket.acquire(), request=True)
+            response = self.next.send(request)
+            delay = _throttle_delay(kind, bucket, response.http_response, attempt)
+            if delay is None:
+                return response
+            time.sleep(delay)
+
+        return response
+
+class AsyncGovernorPolicy(AsyncHTTPPolicy):
+    """GovernorPolicy for the aio clients; waits with asyncio.sleep."""
+
+    async def send(self, request):
+        kind, bucket = _request_bucket(request.http_request)
+
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            governor.record(wait_seconds=await bucket.acquire_async(), request=True)
+            response = await self.next.send(request)
+            delay = _throttle_delay(kind, bucket, response.http_response, attempt)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+        return response
@@ -0,0 +1,76 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.pipeline.transport import RequestsTransport
+from arm_governor import GovernorPolicy
+
+# Connection pool for the shared transport. Each region keeps a few
+# requests in flight (LRO submit + pollers), so size it for many regions.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 64
+
+_lock = threading.Lock()
+_transport = None
+_clients = {}
+_simulator = None
+
+def use_simulator(simulator):
+    """
+    Routes get_client() to an azure_simulator.AzureSimulator instead of
+    Azure (pass None to switch back). Cached real clients are kept.
+    """
+    global _simulator
+    _simulator = simulator
+
+def configure_pool(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Replaces the shared transport with one using the given pool sizes.
+    Clients created afterwards use the new pool; call before deploying.
+    """
+    global _transport
+    with _lock:
+        _transport = _create_transport(pool_connections, pool_maxsize)
+        _clients.clear()
+
+def _create_transport(pool_connections, pool_maxsize):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # session_owner=False keeps the session (and its warm connections)
+    # open when an individual client is closed
+    return RequestsTransport(session=session, session_owner=False)
+
+def get_transport():
+    global _transport
+    with _lock:
+        if _transport is None:
+            _transport = _create_transport(POOL_CONNECTIONS, POOL_MAXSIZE)
+        return _transport
+
+def get_client(client_class, credential, subscription_id=None):
+    """
+    Returns the shared management client of client_class for
+    (credential, subscription_id), creating it on first use. All clients
+    send their requests through one pooled HTTP transport and are paced
+    by the process-wide ARM governor.
+    """
+    if _simulator is not None:
+        return _simulator.client(client_class, subscription_id)
+
+    key = (client_class, credential, subscription_id)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    transport = get_transport()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            options = {"transport": transport, "per_retry_policies": [GovernorPolicy()]}
+            if subscription_id is None:
+                client = client_class(credential, **options)
+            else:
+                client = client_class(credential, subscription_id, **options)
+            _clients[key] = client
+        return client
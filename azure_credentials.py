@@ -0,0 +1,94 @@
+import base64
+import json
+import threading
+import time
+from azure.identity import AzureCliCredential
+
+ARM_SCOPE = "https://management.azure.com/.default"
+
+# Refresh a token this many seconds before it expires
+REFRESH_MARGIN_SECONDS = 300
+# Below this remaining lifetime a token is treated as unusable
+MIN_VALIDITY_SECONDS = 30
+
+class CachingCredential:
+    """
+    Wraps a credential (AzureCliCredential by default) and caches access
+    tokens per scope, so the `az account get-access-token` subprocess runs
+    once per scope instead of once per client. A token inside its refresh
+    window is refreshed by one caller while the others keep using it.
+    """
+
+    def __init__(self, credential=None, refresh_margin=REFRESH_MARGIN_SECONDS):
+        self._credential = credential or AzureCliCredential()
+        self._refresh_margin = refresh_margin
+        self._tokens = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_token(self, *scopes, claims=None, tenant_id=None, **kwargs):
+        # Claims challenges need a fresh token, never a cached one
+        if claims:
+            return self._credential.get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+
+        key = (scopes, tenant_id)
+        token = self._tokens.get(key)
+        now = time.time()
+        if token is not None and token.expires_on - now > self._refresh_margin:
+            return token
+
+        lock = self._key_lock(key)
+        if token is not None and token.expires_on - now > MIN_VALIDITY_SECONDS:
+            # Still usable: only one caller refreshes, the rest don't wait
+            if not lock.acquire(blocking=False):
+                return token
+        else:
+            lock.acquire()
+
+        try:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - time.time() <= self._refresh_margin:
+                token = self._credential.get_token(*scopes, tenant_id=tenant_id, **kwargs)
+                self._tokens[key] = token
+            return token
+        finally:
+            lock.release()
+
+    def close(self):
+        self._credential.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def token_identity(credential):
+    """
+    Returns '<tenant id>:<object id>' of the account behind credential,
+    read from its ARM access token's claims, or None if unavailable.
+    """
+    try:
+        payload = credential.get_token(ARM_SCOPE).token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return f"{claims['tid']}:{claims['oid']}"
+    except Exception:
+        return None
+
+_shared_credential = None
+_shared_lock = threading.Lock()
+
+def get_shared_credential():
+    """
+    Returns the process-wide CachingCredential used by DeployVM,
+    MeasureLatency and DeleteVM.
+    """
+    global _shared_credential
+    with _shared_lock:
+        if _shared_credential is None:
+            _shared_credential = CachingCredential()
+        return _shared_credential
@@ -0,0 +1,596 @@
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from types import SimpleNamespace
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from jsonl_log import DEPLOYMENT_LOG, read_records
+from results_writer import get_writer
+
+# Simulated latency per operation: (median seconds, lognormal sigma)
+DEFAULT_LATENCIES = {
+    "read": (0.2, 0.2),
+    "resource_group": (1.0, 0.3),
+    "vnet": (5.0, 0.4),
+    "public_ip": (3.0, 0.4),
+    "nic": (3.0, 0.4),
+    "vm": (60.0, 0.3),
+    "delete": (45.0, 0.3)
+}
+
+# Retries the SDK's RetryPolicy would make on 429 before giving up
+MAX_THROTTLE_RETRIES = 5
+
+class SimulatorConfig:
+    """
+    Tunables for AzureSimulator. Simulated seconds are multiplied by
+    time_scale before sleeping, so the default runs ~1000x faster than
+    Azure. region_multipliers scale every latency in a region (regions
+    not listed get a stable pseudo-random factor between 0.8 and 1.5).
+    throttle_rate and failure_rates are probabilities per request, keyed
+    by operation name as in DEFAULT_LATENCIES.
+    """
+
+    def __init__(self, time_scale=0.001, latencies=None, region_multipliers=None,
+                 throttle_rate=0.0, retry_after=5.0, failure_rates=None,
+                 failing_regions=(), seed=None):
+        self.time_scale = time_scale
+        self.latencies = dict(DEFAULT_LATENCIES, **(latencies or {}))
+        self.region_multipliers = region_multipliers or {}
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.failure_rates = failure_rates or {}
+        self.failing_regions = set(failing_regions)
+        self.seed = seed
+
+class AzureSimulator:
+    """
+    In-memory stand-in for the subset of the Azure management API used
+    by DeployVM, DeleteVM and MeasureLatency. Install it with
+    azure_clients.use_simulator() and get_client() hands out simulated
+    clients with the same method names, LRO pollers and model attributes.
+    """
+
+    def __init__(self, config=None, subscription_ids=("00000000-0000-0000-0000-000000000000",),
+                 locations=None):
+        self.config = config or SimulatorConfig()
+        self.subscription_ids = list(subscription_ids)
+        self.locations = list(locations or [
+            "eastus", "eastus2", "westus", "westus2", "centralus", "northeurope",
+            "westeurope", "uksouth", "southeastasia", "japaneast", "australiaeast"
+        ])
+        self.resource_groups = {}
+        self.resources = {}
+        self.stats = {"requests": 0, "throttles": 0, "failures": 0}
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+
+    # -- plumbing ---------------------------------------------------------
+
+    def client(self, client_class, subscription_id=None):
+        clients = {
+            "SubscriptionClient": SimSubscriptionClient,
+            "ResourceManagementClient": SimResourceClient,
+            "NetworkManagementClient": SimNetworkClient,
+            "ComputeManagementClient": SimComputeClient
+        }
+        return clients[client_class.__name__](self, subscription_id)
+
+    def _region_multiplier(self, location):
+        if location in self.config.region_multipliers:
+            return self.config.region_multipliers[location]
+        return 0.8 + (zlib.crc32(location.encode()) % 700) / 1000
+
+    def latency(self, operation, location=None):
+        median, sigma = self.config.latencies[operation]
+        with self._lock:
+            seconds = self._random.lognormvariate(0, sigma) * median
+        if location:
+            seconds *= self._region_multiplier(location)
+        return seconds
+
+    def _chance(self, rate):
+        with self._lock:
+            return self._random.random() < rate
+
+    def request(self, operation, location=None):
+        """
+        Accounts for one ARM request: applies throttling (retried like the
+        SDK's RetryPolicy, up to MAX_THROTTLE_RETRIES), then the request's
+        own round trip.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+        for _ in range(MAX_THROTTLE_RETRIES + 1):
+            if not self._chance(self.config.throttle_rate):
+                break
+            with self._lock:
+                self.stats["throttles"] += 1
+            time.sleep(self.config.retry_after * self.config.time_scale)
+        else:
+            raise simulated_error(429, "Too Many Requests (simulated)")
+        time.sleep(self.latency("read", location) * self.config.time_scale)
+
+    def should_fail(self, operation, location):
+        if location in self.config.failing_regions:
+            return True
+        return self._chance(self.config.failure_rates.get(operation, 0.0))
+
+    def resource_id(self, subscription_id, resource_group, provider, name):
+        return (f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
+                f"/providers/{provider}/{name}")
+
+    def store(self, resource_id, resource_group, model):
+        with self._lock:
+            if resource_group.lower() not in self.resource_groups:
+                raise ResourceNotFoundError(f"Resource group '{resource_group}' could not be found.")
+            self.resources[resource_id.lower()] = model
+
+    def fetch(self, resource_id):
+        with self._lock:
+            model = self.resources.get(resource_id.lower())
+        if model is None:
+            raise ResourceNotFoundError(f"Resource '{resource_id}' was not found.")
+        return model
+
+    def begin(self, operation, location, create):
+        """
+        Submits a simulated LRO: the request is accepted after one round
+        trip and the poller completes once the operation's latency has
+        elapsed, at which point create() materialises the resource.
+        """
+        self.request(operation, location)
+        seconds = self.latency(operation, location)
+        fails = self.should_fail(operation, location)
+        return SimPoller(self, operation, seconds, fails, create)
+
+class SimPoller:
+    def __init__(self, simulator, operation, seconds, fails, create):
+        self._simulator = simulator
+        self._operation = operation
+        self._fails = fails
+        self._create = create
+        self._deadline = time.monotonic() + seconds * simulator.config.time_scale
+        self._result = None
+        self._done = False
+
+    def continuation_token(self):
+        return f"sim:{self._operation}:{id(self)}"
+
+    def done(self):
+        return self._done or time.monotonic() >= self._deadline
+
+    def wait(self, timeout=None):
+        remaining = self._deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining if timeout is None else min(timeout, remaining))
+
+    def result(self, timeout=None):
+        if not self._done:
+            remaining = self._deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            if self._fails:
+                with self._simulator._lock:
+                    self._simulator.stats["failures"] += 1
+                raise simulated_error(500, f"Simulated {self._operation} failure")
+            self._result = self._create()
+            self._done = True
+        return self._result
+
+def simulated_error(status_code, message):
+    error = HttpResponseError(message=message)
+    error.status_code = status_code
+    return error
+
+def _get(params, key, default=None):
+    return params.get(key, default) if isinstance(params, dict) else getattr(params, key, default)
+
+# -- simulated clients ----------------------------------------------------
+
+class _SimClient:
+    def __init__(self, simulator, subscription_id):
+        self._sim = simulator
+        self._subscription_id = subscription_id
+
+    def close(self):
+        pass
+
+class SimSubscriptionClient(_SimClient):
+    def __init__(self, simulator, subscription_id=None):
+        super().__init__(simulator, subscription_id)
+        self.subscriptions = self
+
+    def list(self):
+        self._sim.request("read")
+        return [
+            SimpleNamespace(subscription_id=sub_id, display_name=f"Simulated {idx}", state="Enabled")
+            for idx, sub_id in enumerate(self._sim.subscription_ids, 1)
+        ]
+
+    def list_locations(self, subscription_id):
+        self._sim.request("read")
+        return [SimpleNamespace(name=name, display_name=f"{name} (simulated)") for name in self._sim.locations]
+
+class SimResourceClient(_SimClient):
+    def __init__(self, simulator, subscription_id):
+        super().__init__(simulator, subscription_id)
+        self.resource_groups = SimResourceGroups(simulator, subscription_id)
+        self.resources = SimResources(simulator, subscription_id)
+        self.providers = SimProviders(simulator, subscription_id)
+
+class SimResourceGroups(_SimClient):
+    def create_or_update(self, resource_group_name, parameters, **kwargs):
+        location = _get(parameters, "location")
+        self._sim.request("resource_group", location)
+        time.sleep(self._sim.latency("resource_group", location) * self._sim.config.time_scale)
+        group = SimpleNamespace(
+            id=f"/subscriptions/{self._subscription_id}/resourceGroups/{resource_group_name}",
+            name=resource_group_name,
+            location=location,
+            properties=SimpleNamespace(provisioning_state="Succeeded")
+        )
+        with self._sim._lock:
+            self._sim.resource_groups[resource_group_name.lower()] = group
+        return group
+
+    def get(self, resource_group_name, **kwargs):
+        self._sim.request("read")
+        with self._sim._lock:
+            group = self._sim.resource_groups.get(resource_group_name.lower())
+        if group is None:
+            raise ResourceNotFoundError(f"Resource group '{resource_group_name}' could not be found.")
+        return group
+
+    def list(self, **kwargs):
+        self._sim.request("read")
+        with self._sim._lock:
+            return list(self._sim.resource_groups.values())
+
+    def begin_delete(self, resource_group_name, **kwargs):
+        with self._sim._lock:
+            group = self._sim.resource_groups.get(resource_group_name.lower())
+        if group is None:
+            raise ResourceNotFoundError(f"Resource group '{resource_group_name}' could not be found.")
+
+        def delete():
+            prefix = f"{group.id}/".lower()
+            with self._sim._lock:
+                self._sim.resource_groups.pop(resource_group_name.lower(), None)
+                for resource_id in [r for r in self._sim.resources if r.startswith(prefix)]:
+                    del self._sim.resources[resource_id]
+
+        return self._sim.begin("delete", group.location, delete)
+
+class SimResources(_SimClient):
+    def list_by_resource_group(self, resource_group_name, **kwargs):
+        self._sim.request("read")
+        prefix = f"/subscriptions/{self._subscription_id}/resourceGroups/{resource_group_name}/".lower()
+        with self._sim._lock:
+            models = [model for resource_id, model in self._sim.resources.items() if resource_id.startswith(prefix)]
+        return [
+            SimpleNamespace(id=model.id, name=model.name, type=model.type, location=model.location)
+            for model in models
+        ]
+
+    def begin_delete_by_id(self, resource_id, api_version, **kwargs):
+        model = self._sim.fetch(resource_id)
+
+        def delete():
+            with self._sim._lock:
+                self._sim.resources.pop(resource_id.lower(), None)
+
+        return self._sim.begin("delete", model.location, delete)
+
+class SimProviders(_SimClient):
+    def get(self, resource_provider_namespace, **kwargs):
+        self._sim.request("read")
+        types = {
+            "Microsoft.Compute": ["virtualMachines", "disks"],
+            "Microsoft.Network": ["virtualNetworks", "publicIPAddresses", "networkInterfaces"]
+        }.get(resource_provider_namespace, [])
+        return SimpleNamespace(
+            namespace=resource_provider_namespace,
+            resource_types=[
+                SimpleNamespace(resource_type=name, api_versions=["2099-01-01-preview", "2023-09-01"])
+                for name in types
+            ]
+        )
+
+class SimNetworkClient(_SimClient):
+    def __init__(self, simulator, subscription_id):
+        super().__init__(simulator, subscription_id)
+        self.virtual_networks = SimVirtualNetworks(simulator, subscription_id)
+        self.subnets = SimSubnets(simulator, subscription_id)
+        self.public_ip_addresses = SimPublicIps(simulator, subscription_id)
+        self.network_interfaces = SimNetworkInterfaces(simulator, subscription_id)
+
+class _SimResourceOperations(_SimClient):
+    provider = None
+    operation = None
+
+    def _id(self, resource_group_name, name):
+        return self._sim.resource_id(self._subscription_id, resource_group_name, self.provider, name)
+
+    def get(self, resource_group_name, name, **kwargs):
+        self._sim.request("read")
+        return self._sim.fetch(self._id(resource_group_name, name))
+
+    def _begin(self, resource_group_name, name, location, build):
+        resource_id = self._id(resource_group_name, name)
+
+        def create():
+            model = build(resource_id)
+            model.id = resource_id
+            model.name = name
+            model.location = location
+            model.type = self.provider
+            model.provisioning_state = "Succeeded"
+            self._sim.store(resource_id, resource_group_name, model)
+            return model
+
+        return self._sim.begin(self.operation, location, create)
+
+class SimVirtualNetworks(_SimResourceOperations):
+    provider = "Microsoft.Network/virtualNetworks"
+    operation = "vnet"
+
+    def begin_create_or_update(self, resource_group_name, virtual_network_name, parameters, **kwargs):
+        def build(resource_id):
+            subnets = [
+                SimpleNamespace(id=f"{resource_id}/subnets/{_get(s, 'name')}", name=_get(s, 'name'),
+                                address_prefix=_get(s, 'address_prefix'))
+                for s in _get(parameters, 'subnets', [])
+            ]
+            return SimpleNamespace(subnets=subnets)
+
+        return self._begin(resource_group_name, virtual_network_name, _get(parameters, 'location'), build)
+
+class SimSubnets(_SimClient):
+    def get(self, resource_group_name, virtual_network_name, subnet_name, **kwargs):
+        self._sim.request("read")
+        vnet = self._sim.fetch(self._sim.resource_id(
+            self._subscription_id, resource_group_name, SimVirtualNetworks.provider, virtual_network_name))
+        for subnet in vnet.subnets:
+            if subnet.name == subnet_name:
+                return subnet
+        raise ResourceNotFoundError(f"Subnet '{subnet_name}' was not found.")
+
+class SimPublicIps(_SimResourceOperations):
+    provider = "Microsoft.Network/publicIPAddresses"
+    operation = "public_ip"
+
+    def begin_create_or_update(self, resource_group_name, public_ip_address_name, parameters, **kwargs):
+        def build(resource_id):
+            # Addresses from TEST-NET-3, which is never routable
+            with self._sim._lock:
+                host = len(self._sim.resources) % 254 + 1
+            return SimpleNamespace(ip_address=f"203.0.113.{host}")
+
+        return self._begin(resource_group_name, public_ip_address_name, _get(parameters, 'location'), build)
+
+class SimNetworkInterfaces(_SimResourceOperations):
+    provider = "Microsoft.Network/networkInterfaces"
+    operation = "nic"
+
+    def list(self, resource_group_name, **kwargs):
+        self._sim.request("read")
+        prefix = f"/subscriptions/{self._subscription_id}/resourceGroups/{resource_group_name}/".lower()
+        with self._sim._lock:
+            nics = [m for r, m in self._sim.resources.items() if r.startswith(prefix) and m.type == self.provider]
+            attached = {
+                nic.id.lower(): vm.id
+                for vm in self._sim.resources.values() if vm.type == SimVirtualMachines.provider
+                for nic in vm.network_profile.network_interfaces
+            }
+        for nic in nics:
+            vm_id = attached.get(nic.id.lower())
+            nic.virtual_machine = SimpleNamespace(id=vm_id) if vm_id else None
+        return nics
+
+    def begin_create_or_update(self, resource_group_name, network_interface_name, parameters, **kwargs):
+        def build(resource_id):
+            configs = []
+            for config in _get(parameters, 'ip_configurations', []):
+                public_ip = _get(config, 'public_ip_address')
+                configs.append(SimpleNamespace(
+                    name=_get(config, 'name'),
+                    subnet=SimpleNamespace(id=_get(_get(config, 'subnet'), 'id')),
+                    public_ip_address=SimpleNamespace(id=_get(public_ip, 'id')) if public_ip else None
+                ))
+            return SimpleNamespace(ip_configurations=configs)
+
+        return self._begin(resource_group_name, network_interface_name, _get(parameters, 'location'), build)
+
+class SimComputeClient(_SimClient):
+    def __init__(self, simulator, subscription_id):
+        super().__init__(simulator, subscription_id)
+        self.virtual_machines = SimVirtualMachines(simulator, subscription_id)
+        self.usage = SimUsage(simulator, subscription_id)
+        self.virtual_machine_sizes = SimVirtualMachineSizes(simulator, subscription_id)
+        self.resource_skus = SimResourceSkus(simulator, subscription_id)
+        self.virtual_machine_images = SimVirtualMachineImages(simulator, subscription_id)
+
+class SimVirtualMachines(_SimResourceOperations):
+    provider = "Microsoft.Compute/virtualMachines"
+    operation = "vm"
+
+    def begin_create_or_update(self, resource_group_name, vm_name, parameters, **kwargs):
+        def build(resource_id):
+            nics = _get(_get(parameters, 'network_profile'), 'network_interfaces', [])
+            for nic in nics:
+                self._sim.fetch(_get(nic, 'id'))
+            return SimpleNamespace(
+                hardware_profile=SimpleNamespace(vm_size=_get(_get(parameters, 'hardware_profile'), 'vm_size')),
+                network_profile=SimpleNamespace(
+                    network_interfaces=[SimpleNamespace(id=_get(nic, 'id')) for nic in nics]
+                ),
+                time_created=None
+            )
+
+        return self._begin(resource_group_name, vm_name, _get(parameters, 'location'), build)
+
+    def list_all(self, **kwargs):
+        self._sim.request("read")
+        with self._sim._lock:
+            return [m for m in self._sim.resources.values() if m.type == self.provider]
+
+class SimUsage(_SimClient):
+    def list(self, location, **kwargs):
+        self._sim.request("read", location)
+        with self._sim._lock:
+            used = sum(
+                _SIM_SIZE_CORES.get(m.hardware_profile.vm_size, 2)
+                for m in self._sim.resources.values()
+                if m.type == SimVirtualMachines.provider and m.location == location
+            )
+        return [SimpleNamespace(name=SimpleNamespace(value="cores", localized_value="Total Regional vCPUs"),
+                                current_value=used, limit=100)]
+
+class SimVirtualMachineSizes(_SimClient):
+    def list(self, location, **kwargs):
+        self._sim.request("read", location)
+        return [SimpleNamespace(name=name, number_of_cores=cores) for name, cores in _SIM_SIZE_CORES.items()]
+
+class SimResourceSkus(_SimClient):
+    def list(self, filter=None, **kwargs):
+        # Only the "location eq '<region>'" filter is understood
+        location = filter.split("'")[1] if filter else None
+        self._sim.request("read", location)
+        return [
+            SimpleNamespace(
+                name=name, resource_type="virtualMachines", family=None,
+                locations=[location] if location else [],
+                location_info=[SimpleNamespace(location=location, zones=["1", "2", "3"])] if location else [],
+                capabilities=[
+                    SimpleNamespace(name="vCPUs", value=str(cores)),
+                    SimpleNamespace(name="MemoryGB", value=str(_SIM_SIZE_MEMORY_GB[name])),
+                    SimpleNamespace(name="MaxDataDiskCount", value=str(min(cores * 4, 32))),
+                    SimpleNamespace(name="AcceleratedNetworkingEnabled", value=str(cores >= 2)),
+                    SimpleNamespace(name="EphemeralOSDiskSupported", value=str(not name.startswith("Standard_B")))
+                ],
+                restrictions=[]
+            )
+            for name, cores in _SIM_SIZE_CORES.items()
+        ]
+
+class SimVirtualMachineImages(_SimClient):
+    def list_offers(self, location, publisher_name, **kwargs):
+        self._sim.request("read", location)
+        return [SimpleNamespace(name=offer) for offer in _SIM_IMAGES.get(publisher_name, {})]
+
+    def list_skus(self, location, publisher_name, offer, **kwargs):
+        self._sim.request("read", location)
+        return [SimpleNamespace(name=sku) for sku in _SIM_IMAGES.get(publisher_name, {}).get(offer, [])]
+
+_SIM_IMAGES = {
+    "Canonical": {
+        "UbuntuServer": ["18.04-LTS", "20.04-LTS"],
+        "0001-com-ubuntu-server-focal": ["20_04-lts", "20_04-lts-gen2"],
+        "0001-com-ubuntu-server-jammy": ["22_04-lts", "22_04-lts-gen2"]
+    },
+    "MicrosoftWindowsServer": {
+        "WindowsServer": ["2019-Datacenter", "2022-Datacenter", "2022-datacenter-azure-edition"]
+    },
+    "RedHat": {"RHEL": ["8-lvm-gen2", "9-lvm-gen2"]},
+    "SUSE": {"sles-15-sp5": ["gen2"]},
+    "debian": {"debian-12": ["12", "12-gen2"]}
+}
+
+_SIM_SIZE_CORES = {
+    "Standard_B1s": 1, "Standard_B2s": 2, "Standard_B4ms": 4, "Standard_B8ms": 8,
+    "Standard_D2s_v3": 2, "Standard_D4s_v3": 4, "Standard_D8s_v3": 8,
+    "Standard_E2s_v3": 2, "Standard_E4s_v3": 4, "Standard_F2s_v2": 2, "Standard_F4s_v2": 4
+}
+
+_SIM_SIZE_MEMORY_GB = {
+    "Standard_B1s": 1, "Standard_B2s": 4, "Standard_B4ms": 16, "Standard_B8ms": 32,
+    "Standard_D2s_v3": 8, "Standard_D4s_v3": 16, "Standard_D8s_v3": 32,
+    "Standard_E2s_v3": 16, "Standard_E4s_v3": 32, "Standard_F2s_v2": 4, "Standard_F4s_v2": 8
+}
+
+# -- load test --------------------------------------------------------------
+
+def run_load_test(regions=50, vms=500, max_workers=None, config=None):
+    """
+    Drives DeployVM.deploy_to_regions against the simulator: vms/regions
+    trials per region, each torn down afterwards. Reports throughput,
+    peak traced memory and whether every VM was logged exactly once.
+    """
+    import azure_clients
+    import DeployVM
+
+    locations = [f"simregion{idx:02d}" for idx in range(1, regions + 1)]
+    simulator = AzureSimulator(config, locations=locations)
+    azure_clients.use_simulator(simulator)
+
+    trials = max(1, vms // regions)
+    vm_config = {
+        'vm_name': 'loadtest',
+        'resource_group_name': 'loadtest-rg',
+        'vm_size': 'Standard_B1s',
+        'vm_image': {'publisher': 'Canonical', 'offer': 'UbuntuServer', 'sku': '18.04-LTS', 'version': 'latest'},
+        'trials': trials,
+        'teardown': True
+    }
+
+    tracemalloc.start()
+    started = time.monotonic()
+    try:
+        results = DeployVM.deploy_to_regions(
+            DeployVM.get_credentials(), simulator.subscription_ids[0], locations, vm_config,
+            max_workers=max_workers)
+    finally:
+        azure_clients.use_simulator(None)
+    elapsed = time.monotonic() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    get_writer().flush()
+    entries = [e for e in read_records(DEPLOYMENT_LOG) if e.get('status') == 'succeeded']
+    expected = trials * regions - simulator.stats["failures"]
+    unique = {(e['location'], e['trial']) for e in entries}
+
+    print(f"\nSimulated {trials * regions} deployments across {regions} regions in {elapsed:.2f} s")
+    print(f"Throughput: {trials * regions / elapsed:.1f} deployments/s")
+    print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+    print(f"ARM requests: {simulator.stats['requests']}, throttled: {simulator.stats['throttles']}, "
+          f"injected failures: {simulator.stats['failures']}")
+    print(f"Logged {len(entries)} successful deployments ({len(unique)} unique), expected {expected}; "
+          f"{sum(1 for e in results.values() if e)} regions reported errors")
+    print(f"Resources left behind: {len(simulator.resources)}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the deployment engine against the offline Azure simulator")
+    parser.add_argument("--regions", type=int, default=50)
+    parser.add_argument("--vms", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None, help="parallel regions (default: all)")
+    parser.add_argument("--time-scale", type=float, default=0.001, help="real seconds per simulated second")
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--vm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        time_scale=args.time_scale,
+        throttle_rate=args.throttle_rate,
+        failure_rates={"vm": args.vm_failure_rate},
+        seed=args.seed
+    )
+
+    # Keep the simulated run's logs out of the real deployment log
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            run_load_test(args.regions, args.vms, args.workers, config)
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    main()
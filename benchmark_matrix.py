@@ -0,0 +1,168 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from preflight import get_region_capacities
+from size_catalog import SizeIndex
+from DeployVM import COMMON_VM_SIZES, run_trials
+
+class MatrixJob:
+    def __init__(self, region, vm_size, vm_image, vcpus, vm_config):
+        self.region = region
+        self.vm_size = vm_size
+        self.vm_image = vm_image
+        self.vcpus = vcpus
+        self.vm_config = vm_config
+
+def expand_matrix(regions, sizes, images, vm_config):
+    """
+    Expands regions x sizes x images into one job per cell. Each cell gets
+    its own VM and resource group name so cells in the same region can
+    run side by side; matrix cells are always torn down afterwards to
+    hand their vCPUs back to the region's quota.
+    """
+    vcpus_by_size = {size['name']: size['cores'] for size in COMMON_VM_SIZES}
+    jobs = []
+    for size_idx, vm_size in enumerate(sizes, 1):
+        for image_idx, vm_image in enumerate(images, 1):
+            cell = f"s{size_idx}i{image_idx}"
+            cell_config = dict(
+                vm_config,
+                vm_name=f"{vm_config['vm_name']}-{cell}",
+                resource_group_name=f"{vm_config['resource_group_name']}-{cell}",
+                vm_size=vm_size,
+                vm_image=vm_image,
+                teardown=True
+            )
+            for region in regions:
+                jobs.append(MatrixJob(region, vm_size, vm_image, vcpus_by_size.get(vm_size), cell_config))
+    return jobs
+
+def fetch_vcpu_quotas(credential, subscription_id, regions):
+    """
+    Returns {region: free regional vCPUs} from the compute usage API,
+    reusing the pre-flight check's cached usage where it's still fresh.
+    None means the quota is unknown and the region is not limited.
+    """
+    try:
+        capacities = get_region_capacities(credential, subscription_id, regions)
+    except Exception as e:
+        print(f"vCPU quotas unavailable, scheduling without them: {e}")
+        return {region: None for region in regions}
+    return {region: capacities[region].free("cores") for region in regions}
+
+def resolve_vcpus(credential, subscription_id, jobs):
+    """Fills in vCPUs for sizes outside COMMON_VM_SIZES from the size catalog."""
+    regions = sorted({job.region for job in jobs if job.vcpus is None})
+    if not regions:
+        return
+    index = SizeIndex.load(credential, subscription_id, regions)
+    for job in jobs:
+        if job.vcpus is None:
+            job.vcpus = index.sizes_by_region[job.region].get(job.vm_size, {}).get('vcpus', 0)
+
+class QuotaScheduler:
+    """
+    Hands out jobs to workers, only releasing a job once its region has
+    enough free vCPUs. Jobs for a saturated region wait while jobs for
+    other regions go ahead. A region with no known quota (None) is never
+    held back.
+    """
+
+    def __init__(self, jobs, quotas):
+        self._pending = list(jobs)
+        self._available = dict(quotas)
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                if not self._pending:
+                    return None
+                for job in self._pending:
+                    available = self._available.get(job.region)
+                    if available is None:
+                        self._pending.remove(job)
+                        return job
+                    if available >= job.vcpus:
+                        self._pending.remove(job)
+                        self._available[job.region] -= job.vcpus
+                        return job
+                self._cond.wait()
+
+    def release(self, job):
+        with self._cond:
+            if self._available.get(job.region) is not None:
+                self._available[job.region] += job.vcpus
+            self._cond.notify_all()
+
+def run_matrix(credential, subscription_id, regions, sizes, images, vm_config,
+               max_workers=None, results_file="matrix_results.json", excluded=None):
+    jobs = expand_matrix(regions, sizes, images, vm_config)
+    resolve_vcpus(credential, subscription_id, jobs)
+    quotas = fetch_vcpu_quotas(credential, subscription_id, regions)
+
+    results = []
+    runnable = []
+    excluded = excluded or {}
+    for job in jobs:
+        if (job.region, job.vm_size) in excluded:
+            results.append(cell_result(job, [], [f"pre-flight: {excluded[(job.region, job.vm_size)]}"]))
+        elif quotas.get(job.region) is not None and job.vcpus > quotas[job.region]:
+            results.append(cell_result(job, [], [f"needs {job.vcpus} vCPUs, only {quotas[job.region]} free"]))
+        else:
+            runnable.append(job)
+
+    print(f"\nMatrix: {len(jobs)} cells, {len(runnable)} runnable within vCPU quota")
+    scheduler = QuotaScheduler(runnable, quotas)
+    results_lock = threading.Lock()
+
+    def worker():
+        while True:
+            job = scheduler.acquire()
+            if job is None:
+                return
+            try:
+                entries, errors = run_trials(credential, subscription_id, job.region, job.vm_config)
+            except Exception as e:
+                entries, errors = [], [e]
+            finally:
+                scheduler.release(job)
+            with results_lock:
+                results.append(cell_result(job, entries, errors))
+
+    workers = max(1, min(max_workers or len(runnable) or 1, len(runnable) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="matrix") as executor:
+        for _ in range(workers):
+            executor.submit(worker)
+
+    with open(results_file, "w") as f:
+        json.dump(results, f, indent=4)
+
+    print_matrix_summary(results)
+    print(f"Matrix results saved to '{results_file}' 📝")
+    return results
+
+def cell_result(job, entries, errors):
+    durations = [entry['duration_seconds'] for entry in entries]
+    return {
+        "region": job.region,
+        "vm_size": job.vm_size,
+        "image": job.vm_image.get('description', f"{job.vm_image['offer']}:{job.vm_image['sku']}"),
+        "vcpus": job.vcpus,
+        "status": "failed" if errors and not entries else "succeeded",
+        "trials": len(entries),
+        "errors": [str(e) for e in errors],
+        "duration_seconds": durations,
+        "mean_duration_seconds": sum(durations) / len(durations) if durations else None
+    }
+
+def print_matrix_summary(results):
+    headers = ["Region", "Size", "Image", "Status", "Trials", "Mean (s)"]
+    rows = [
+        [r['region'], r['vm_size'], r['image'], r['status'], r['trials'],
+         f"{r['mean_duration_seconds']:.1f}" if r['mean_duration_seconds'] is not None else ""]
+        for r in sorted(results, key=lambda r: (r['region'], r['vm_size'], r['image']))
+    ]
+    print("\nMatrix Summary:")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
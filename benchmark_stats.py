@@ -0,0 +1,95 @@
+import numpy as np
+from tabulate import tabulate
+
+# Two-sided 95% Student-t critical values by degrees of freedom
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145,
+    15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980
+}
+
+def t_critical(df):
+    if df < 1:
+        return np.nan
+    # Between table entries use the next lower df: its value is larger,
+    # so the interval errs wide rather than narrow
+    return T_CRITICAL_95[max(bound for bound in T_CRITICAL_95 if bound <= df)]
+
+def summarize_trials(samples):
+    """
+    samples is {region: [duration, ...]}. All regions are padded into one
+    NaN-filled matrix so every statistic is a single vectorised call.
+    Returns {region: {n, min, mean, p50, p95, stddev, ci_low, ci_high}}.
+    """
+    regions = list(samples)
+    if not regions:
+        return {}
+
+    width = max(len(values) for values in samples.values())
+    matrix = np.full((len(regions), width), np.nan)
+    for row, region in enumerate(regions):
+        matrix[row, :len(samples[region])] = samples[region]
+
+    n = np.sum(~np.isnan(matrix), axis=1)
+    mean = np.nanmean(matrix, axis=1)
+    minimum = np.nanmin(matrix, axis=1)
+    p50, p95 = np.nanpercentile(matrix, [50, 95], axis=1)
+    stddev = np.full(len(regions), np.nan)
+    multi = n > 1
+    stddev[multi] = np.nanstd(matrix[multi], axis=1, ddof=1)
+    t = np.array([t_critical(count - 1) for count in n])
+    half_width = t * stddev / np.sqrt(n)
+
+    return {
+        region: {
+            "n": int(n[row]),
+            "min": float(minimum[row]),
+            "mean": float(mean[row]),
+            "p50": float(p50[row]),
+            "p95": float(p95[row]),
+            "stddev": float(stddev[row]),
+            "ci_low": float(mean[row] - half_width[row]),
+            "ci_high": float(mean[row] + half_width[row])
+        }
+        for row, region in enumerate(regions)
+    }
+
+def trial_samples(log_entries, metric="duration_seconds"):
+    samples = {}
+    for entry in log_entries:
+        if entry.get('status') == 'failed' or entry.get(metric) is None:
+            continue
+        samples.setdefault(entry['location'], []).append(entry[metric])
+    return samples
+
+def print_trial_summary(stats):
+    headers = ["Region", "N", "Min", "Mean", "P50", "P95", "Std Dev", "95% CI"]
+    rows = []
+    for region, s in stats.items():
+        ci = "n/a" if np.isnan(s['ci_low']) else f"{s['ci_low']:.1f} - {s['ci_high']:.1f}"
+        rows.append([region, s['n'], f"{s['min']:.1f}", f"{s['mean']:.1f}", f"{s['p50']:.1f}",
+                     f"{s['p95']:.1f}", "n/a" if np.isnan(s['stddev']) else f"{s['stddev']:.1f}", ci])
+
+    print("\nDeployment Duration Statistics (seconds):")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+def plot_trial_summary(stats, output_file="output.png"):
+    """
+    Bar per region at the mean deployment time, with the 95% confidence
+    interval drawn as error bars.
+    """
+    import matplotlib.pyplot as plt
+
+    regions = list(stats)
+    means = np.array([stats[r]['mean'] for r in regions])
+    errors = np.nan_to_num(np.array([stats[r]['ci_high'] for r in regions]) - means)
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(regions, means, yerr=errors, capsize=6, color='skyblue', ecolor='black')
+    plt.title('Mean VM Deployment Duration by Region (95% CI)', fontsize=14)
+    plt.xlabel('Region', fontsize=12)
+    plt.ylabel('Deployment Duration (seconds)', fontsize=12)
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(output_file)
@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+from azure.mgmt.subscription import SubscriptionClient
+from azure_clients import get_client
+from azure_credentials import token_identity
+
+CACHE_FILE = "catalog_cache.json"
+
+# Seconds each kind of entry stays fresh. Stale entries are still served
+# and refreshed in the background; missing entries are fetched inline.
+TTL_SECONDS = {
+    'subscriptions': 24 * 3600,
+    'regions': 7 * 24 * 3600,
+    'sizes': 24 * 3600,
+    'images': 7 * 24 * 3600,
+}
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+class CatalogCache:
+    """
+    On-disk cache for slow-changing ARM catalog data (subscriptions,
+    regions, VM sizes, images). Values must be JSON-serialisable.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        # Write to a temp file and swap it in so a crash never leaves a torn cache
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def _store(self, cache_key, data):
+        with self._lock:
+            self._entries[cache_key] = {'fetched': time.time(), 'data': data}
+            self._save()
+
+    def get(self, entity, key, fetch):
+        """
+        Returns the cached value for (entity, key), calling fetch() when
+        there is none. A stale value is returned as-is while fetch() runs
+        on a background thread to replace it.
+        """
+        cache_key = f"{entity}:{key}"
+        with self._lock:
+            entry = self._entries.get(cache_key)
+
+        if entry is None:
+            data = fetch()
+            self._store(cache_key, data)
+            return data
+
+        if time.time() - entry['fetched'] > TTL_SECONDS.get(entity, DEFAULT_TTL_SECONDS):
+            self._refresh_in_background(cache_key, fetch)
+        return entry['data']
+
+    def _refresh_in_background(self, cache_key, fetch):
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self._store(cache_key, fetch())
+            except Exception:
+                pass  # keep serving the stale entry; the next read retries
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, name=f"catalog-{cache_key}", daemon=True).start()
+
+    def invalidate(self, entity=None):
+        """Drops every entry, or only those of one entity type."""
+        with self._lock:
+            if entity is None:
+                self._entries = {}
+            else:
+                self._entries = {k: v for k, v in self._entries.items() if not k.startswith(f"{entity}:")}
+            self._save()
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Returns the process-wide catalog cache."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = CatalogCache()
+        return _catalog
+
+def cached_subscriptions(credential):
+    """
+    Returns [{'subscription_id', 'display_name', 'state'}] for the
+    signed-in account. Cached per tenant and account, so signing in as
+    someone else never shows the previous account's list; when the
+    identity can't be read the list is fetched uncached.
+    """
+
+    def fetch():
+        subscription_client = get_client(SubscriptionClient, credential)
+        return [
+            {'subscription_id': sub.subscription_id, 'display_name': sub.display_name, 'state': getattr(sub.state, 'value', sub.state)}
+            for sub in subscription_client.subscriptions.list()
+        ]
+
+    identity = token_identity(credential)
+    if identity is None:
+        return fetch()
+    return get_catalog().get('subscriptions', identity, fetch)
+
+def cached_regions(credential, subscription_id):
+    """Returns [{'name', 'display_name'}] for the subscription's locations."""
+
+    def fetch():
+        subscription_client = get_client(SubscriptionClient, credential)
+        return [
+            {'name': location.name, 'display_name': location.display_name}
+            for location in subscription_client.subscriptions.list_locations(subscription_id)
+        ]
+
+    return get_catalog().get('regions', subscription_id, fetch)
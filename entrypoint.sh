@@ -16,9 +16,10 @@ while true; do
     echo "4. Measure VM Latency"
     echo "5. Plot Latency Graph"
     echo "6. View Latency Graph (Port 5001)"
-    echo "7. Exit"
+    echo "7. Export History to Parquet"
+    echo "8. Exit"
     echo "================================"
-    read -p "Enter your choice [1-7]: " choice
+    read -p "Enter your choice [1-8]: " choice
 
     case "$choice" in
         1)
@@ -46,6 +47,10 @@ while true; do
             python3 serve_latency.py
             ;;
         7)
+            echo "[*] Exporting results history to Parquet (exports/)..."
+            python3 export_parquet.py
+            ;;
+        8)
             echo "Peace out, Cloud Commander 🚀"
             exit 0
             ;;
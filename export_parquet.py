@@ -0,0 +1,132 @@
+import argparse
+import datetime
+import os
+import pyarrow as pa
+import pyarrow.dataset as ds
+from phase_timer import PHASES
+from results_store import get_store
+
+EXPORT_DIR = "exports"
+
+PARTITIONING = ds.partitioning(pa.schema([("run_date", pa.date32()), ("location", pa.string())]), flavor="hive")
+
+DEPLOYMENT_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.string()),
+        ("run_date", pa.date32()),
+        ("location", pa.string()),
+        ("vm_name", pa.string()),
+        ("vm_size", pa.string()),
+        ("image", pa.string()),
+        ("trial", pa.int32()),
+        ("status", pa.string()),
+        ("start_time_utc", pa.timestamp("us")),
+        ("end_time_utc", pa.timestamp("us")),
+        ("duration_seconds", pa.float64()),
+        ("total_seconds", pa.float64()),
+        ("server_duration_seconds", pa.float64()),
+        ("governor_wait_seconds", pa.float64()),
+        ("throttle_count", pa.int32()),
+        ("release_skew_seconds", pa.float64()),
+        ("resumed", pa.bool_()),
+        ("error", pa.string()),
+    ]
+    + [
+        (f"{phase}_{metric}", pa.int32() if metric == "polls" else pa.float64())
+        for phase in PHASES
+        for metric in ("submit_seconds", "completion_seconds", "total_seconds", "polls")
+    ]
+)
+
+LATENCY_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("run_date", pa.date32()),
+    ("location", pa.string()),
+    ("vm_name", pa.string()),
+    ("ip", pa.string()),
+    ("port_used", pa.int32()),
+    ("latency_ms", pa.float64()),
+    ("measured_utc", pa.timestamp("us")),
+])
+
+def _timestamp(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+def run_date(run_id, fallback):
+    """Run ids start with the run's UTC date (YYYYMMDD); otherwise use fallback's date."""
+    try:
+        return datetime.datetime.strptime((run_id or "")[:8], "%Y%m%d").date()
+    except ValueError:
+        return _timestamp(fallback).date()
+
+def deployment_row(entry):
+    row = {name: entry.get(name) for name in DEPLOYMENT_SCHEMA.names}
+    row["run_date"] = run_date(entry.get("run_id"), entry["recorded_utc"])
+    row["start_time_utc"] = _timestamp(entry.get("start_time_utc"))
+    row["end_time_utc"] = _timestamp(entry.get("end_time_utc"))
+    row["resumed"] = bool(entry.get("resumed"))
+    for phase, span in (entry.get("phases") or {}).items():
+        for metric in ("submit_seconds", "completion_seconds", "total_seconds", "polls"):
+            if f"{phase}_{metric}" in row:
+                row[f"{phase}_{metric}"] = span.get(metric)
+    return row
+
+def latency_row(sample):
+    row = {name: sample.get(name) for name in LATENCY_SCHEMA.names}
+    row["run_date"] = run_date(sample.get("run_id"), sample["measured_utc"])
+    row["measured_utc"] = _timestamp(sample["measured_utc"])
+    return row
+
+def write_partitioned(rows, schema, directory):
+    """
+    Writes rows as Parquet under directory/run_date=.../location=.../.
+    Partitions being written are replaced, so re-exporting compacts each
+    into a single file instead of adding duplicates.
+    """
+    table = pa.Table.from_pylist(rows, schema=schema)
+    ds.write_dataset(
+        table, directory, format="parquet", partitioning=PARTITIONING,
+        basename_template="part-{i}.parquet", existing_data_behavior="delete_matching"
+    )
+    return table.num_rows
+
+def window_rows(fetch, to_row, days):
+    """
+    Returns the rows of every run_date/location partition with a result in
+    the last days (all rows when days is None). Partitions are replaced
+    whole, so one only partly inside the window is read in full.
+    """
+    rows = [to_row(record) for record in fetch(days=days)]
+    if days is None or not rows:
+        return rows
+
+    partitions = {(row["run_date"], row["location"]) for row in rows}
+    # Nothing is recorded before its run's date, so reading from the
+    # earliest partition's midnight covers all of their rows
+    since = datetime.datetime.combine(min(run_date for run_date, _ in partitions), datetime.time())
+    days = (datetime.datetime.utcnow() - since).total_seconds() / 86400
+    return [row for row in map(to_row, fetch(days=days)) if (row["run_date"], row["location"]) in partitions]
+
+def export_history(output_dir=EXPORT_DIR, days=None):
+    store = get_store()
+    deployments = window_rows(store.deployments, deployment_row, days)
+    latency = window_rows(store.latency_samples, latency_row, days)
+
+    if deployments:
+        count = write_partitioned(deployments, DEPLOYMENT_SCHEMA, os.path.join(output_dir, "deployments"))
+        print(f"📦 Exported {count} deployments to '{os.path.join(output_dir, 'deployments')}'")
+    if latency:
+        count = write_partitioned(latency, LATENCY_SCHEMA, os.path.join(output_dir, "latency"))
+        print(f"📦 Exported {count} latency samples to '{os.path.join(output_dir, 'latency')}'")
+    if not deployments and not latency:
+        print("📭 No results to export.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export benchmark history to Parquet partitioned by run date and region")
+    parser.add_argument("--out", default=EXPORT_DIR, help=f"output directory (default: {EXPORT_DIR})")
+    parser.add_argument("--days", type=int, default=None, help="only partitions with results from the last N days")
+    args = parser.parse_args()
+    export_history(args.out, args.days)
+
+if __name__ == "__main__":
+    main()
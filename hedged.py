@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from lro_polling import expected_for
+from resource_graph import DeploymentCancelled
+from results_store import image_label
+from DeployVM import (
+    COMMON_VM_SIZES,
+    create_infrastructure,
+    teardown_resource_group,
+    log_deployment_failure,
+    append_deployment_log
+)
+
+def expected_total(expected):
+    """
+    Critical-path estimate of a full deployment from per-phase medians
+    (expected_for() output); None when any phase has no history.
+    """
+    try:
+        network = max(expected["vnet"] + expected.get("subnet", 0), expected["public_ip"])
+        return expected.get("resource_group", 0) + network + expected["nic"] + expected["vm"]
+    except KeyError:
+        return None
+
+class HedgeRace:
+    """
+    Shared state of one hedged deployment: the first region to finish
+    becomes the winner and sets the cancel event for everyone else.
+    """
+
+    def __init__(self):
+        self.cancel = threading.Event()
+        self.winner = None
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def claim(self, region):
+        with self._lock:
+            if self.winner is None:
+                self.winner = region
+                self.cancel.set()
+                return True
+            return False
+
+def race_region(credential, subscription_id, region, vm_config, race):
+    """
+    Deploys one candidate. A region that doesn't win (cancelled, failed,
+    or finished second) tears its resource group down right away. A
+    candidate that finished second is logged with status 'abandoned', so
+    only the winner counts as a succeeded deployment.
+    """
+    rg_name = f"{vm_config['resource_group_name']}-{region}"
+    vm_name = f"{vm_config['vm_name']}-{region}"
+    outcome = {"region": region}
+
+    try:
+        entry = create_infrastructure(
+            credential, subscription_id, rg_name, region, vm_name,
+            vm_config['vm_size'], vm_config['vm_image'],
+            server_timestamps=vm_config.get('server_timestamps', False),
+            lro_history=vm_config.get('lro_history'),
+            cancel=race.cancel,
+            save_log=False
+        )
+        outcome["seconds_to_vm"] = round(time.monotonic() - race.started, 3)
+        outcome["duration_seconds"] = entry["duration_seconds"]
+        if race.claim(region):
+            outcome["status"] = "won"
+            append_deployment_log(entry)
+            return outcome
+        outcome["status"] = "finished late"
+        entry["status"] = "abandoned"
+        append_deployment_log(entry)
+    except DeploymentCancelled:
+        outcome["status"] = "cancelled"
+    except Exception as e:
+        outcome["status"] = "failed"
+        outcome["error"] = str(e)
+        log_deployment_failure(vm_name, region, e, vm_size=vm_config['vm_size'],
+                               image=image_label(vm_config['vm_image']))
+
+    outcome["abandoned_after_seconds"] = round(time.monotonic() - race.started, 3)
+    try:
+        teardown_resource_group(credential, subscription_id, rg_name, region)
+    except Exception as e:
+        outcome["teardown_error"] = str(e)
+    # Upper bound on how long this candidate's resources existed
+    outcome["resource_seconds"] = round(time.monotonic() - race.started, 3)
+    return outcome
+
+def run_hedged(credential, subscription_id, regions, vm_config, results_file="hedged_results.json"):
+    """
+    Starts the same VM spec in every candidate region at once, keeps the
+    first one to finish and tears the others down concurrently. Records
+    the time saved against the candidates' historical critical paths and
+    the extra resource time spent on the losers.
+    """
+    race = HedgeRace()
+    print(f"\nHedged deployment: racing {len(regions)} regions, keeping the first VM to finish")
+
+    with ThreadPoolExecutor(max_workers=len(regions), thread_name_prefix="hedge") as executor:
+        outcomes = list(executor.map(
+            lambda region: race_region(credential, subscription_id, region, vm_config, race), regions
+        ))
+
+    history = vm_config.get('lro_history')
+    expected = {
+        region: expected_total(expected_for(history, region, vm_config['vm_size'])) for region in regions
+    }
+    for outcome in outcomes:
+        outcome["expected_seconds"] = expected[outcome["region"]]
+
+    winner = next((o for o in outcomes if o["status"] == "won"), None)
+    losers = [o for o in outcomes if o["status"] != "won"]
+    known = [seconds for seconds in expected.values() if seconds is not None]
+    vcpus = next((size['cores'] for size in COMMON_VM_SIZES if size['name'] == vm_config['vm_size']), None)
+    extra_seconds = round(sum(o["resource_seconds"] for o in losers), 3)
+
+    result = {
+        "vm_size": vm_config['vm_size'],
+        "candidates": regions,
+        "winner": winner["region"] if winner else None,
+        "seconds_to_vm": winner["seconds_to_vm"] if winner else None,
+        # Against the slowest and the average candidate's expected time
+        "tail_saved_seconds": round(max(known) - winner["seconds_to_vm"], 3) if winner and known else None,
+        "mean_saved_seconds": round(sum(known) / len(known) - winner["seconds_to_vm"], 3) if winner and known else None,
+        "extra_resource_seconds": extra_seconds,
+        "extra_vcpu_seconds": round(extra_seconds * vcpus, 3) if vcpus else None,
+        "regions": outcomes
+    }
+
+    with open(results_file, "w") as f:
+        json.dump(result, f, indent=4)
+
+    print_hedged_summary(result)
+    print(f"Hedged results saved to '{results_file}' 📝")
+    if winner is None:
+        raise RuntimeError("No candidate region produced a VM")
+    return result
+
+def print_hedged_summary(result):
+    headers = ["Region", "Outcome", "Time to VM (s)", "Expected (s)", "Resources Held (s)", "Error"]
+    rows = [
+        [o["region"], o["status"], o.get("seconds_to_vm", "-"),
+         o["expected_seconds"] if o["expected_seconds"] is not None else "-",
+         o.get("resource_seconds", "-"), o.get("error", "")]
+        for o in result["regions"]
+    ]
+    print("\nHedged Deployment Summary:")
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    if result["winner"]:
+        print(f"🏁 Winner: {result['winner']} after {result['seconds_to_vm']:.2f} seconds")
+    if result["tail_saved_seconds"] is not None:
+        print(f"Tail latency saved: {result['tail_saved_seconds']:.2f}s vs slowest candidate, "
+              f"{result['mean_saved_seconds']:.2f}s vs average")
+    print(f"Extra cost: {result['extra_resource_seconds']:.2f} resource-seconds on losing regions"
+          + (f" ({result['extra_vcpu_seconds']:.2f} vCPU-seconds)" if result["extra_vcpu_seconds"] else ""))
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from azure.mgmt.compute import ComputeManagementClient
+from azure_clients import get_client
+from catalog_cache import get_catalog
+
+# Publishers crawled when none are given
+DEFAULT_PUBLISHERS = [
+    'Canonical',
+    'MicrosoftWindowsServer',
+    'RedHat',
+    'SUSE',
+    'debian'
+]
+
+# Concurrent list_offers/list_skus calls in flight
+CRAWL_WORKERS = 16
+
+def crawl_images(credential, subscription_id, location, publishers=None, max_workers=CRAWL_WORKERS):
+    """
+    Walks publishers -> offers -> SKUs in location with up to max_workers
+    calls in flight, yielding one image dict per SKU as soon as its offer's
+    listing returns. A publisher or offer that fails to list is skipped.
+    """
+    compute_client = get_client(ComputeManagementClient, credential, subscription_id)
+    images_api = compute_client.virtual_machine_images
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-crawl") as executor:
+        pending = {}
+        for publisher in publishers or DEFAULT_PUBLISHERS:
+            pending[executor.submit(images_api.list_offers, location, publisher)] = (publisher, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                publisher, offer = pending.pop(future)
+                try:
+                    listing = future.result()
+                except Exception:
+                    continue
+
+                if offer is None:
+                    # Offers listed: fan out one SKU listing per offer
+                    for item in listing:
+                        pending[executor.submit(images_api.list_skus, location, publisher, item.name)] = (publisher, item.name)
+                    continue
+
+                for sku in listing:
+                    yield {
+                        'publisher': publisher,
+                        'offer': offer,
+                        'sku': sku.name,
+                        'version': 'latest',
+                        'description': f"{offer} {sku.name}"
+                    }
+
+def get_image_index(credential, subscription_id, location, publishers=None, on_image=None):
+    """
+    Returns every image SKU for the publishers in location, sorted, from
+    the on-disk catalog cache when present. On a cache miss the crawl runs
+    and on_image (if given) is called with each image as it arrives.
+    """
+    publishers = publishers or DEFAULT_PUBLISHERS
+
+    def fetch():
+        images = []
+        for image in crawl_images(credential, subscription_id, location, publishers):
+            images.append(image)
+            if on_image:
+                on_image(image)
+        return sorted(images, key=lambda i: (i['publisher'], i['offer'], i['sku']))
+
+    return get_catalog().get('images', f"{location}:{','.join(sorted(publishers))}", fetch)
@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: appends are only serialised within this process
+    fcntl = None
+
+DEPLOYMENT_LOG = "deployment_log.jsonl"
+LATENCY_LOG = "latency_log.jsonl"
+
+_write_lock = threading.Lock()
+
+def append_record(path, record, fsync=False):
+    """
+    Appends one JSON record as a single line. The cost doesn't depend on
+    how much is already in the file. With fsync=True the record is on
+    disk before this returns; otherwise a crash can lose the last few
+    records but never the earlier ones. An exclusive flock keeps other
+    processes appending to the same file from interleaving with us.
+    """
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    with _write_lock:
+        with open(path, "a+b") as f:
+            if fcntl is not None:
+                # Released when the file is closed
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            # A crash can leave a torn last line; start ours on a fresh one
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+def read_records(path):
+    """
+    Yields the records of a JSONL log one at a time, skipping a torn or
+    otherwise unreadable line. Yields nothing if the file doesn't exist.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
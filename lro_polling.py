@@ -0,0 +1,174 @@
+import datetime
+import time
+from azure.mgmt.core.polling.arm_polling import ARMPolling
+from azure.mgmt.core.polling.async_arm_polling import AsyncARMPolling
+from arm_governor import governor
+
+def parse_server_time(value):
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+class _ServerTimesMixin:
+    """
+    Picks startTime/endTime out of each async-operation status response,
+    so the operation's server-side duration is known independently of
+    how long the poller slept between checks.
+    """
+
+    server_start_time = None
+    server_end_time = None
+
+    def _capture_server_times(self):
+        try:
+            body = self._pipeline_response.http_response.json()
+        except Exception:
+            return
+        if not isinstance(body, dict):
+            return
+
+        start = parse_server_time(body.get("startTime"))
+        end = parse_server_time(body.get("endTime"))
+        if start is not None and self.server_start_time is None:
+            self.server_start_time = start
+        if end is not None:
+            self.server_end_time = end
+
+class ServerTimesPolling(_ServerTimesMixin, ARMPolling):
+    def initialize(self, client, initial_response, deserialization_callback):
+        super().initialize(client, initial_response, deserialization_callback)
+        self._capture_server_times()
+
+    def update_status(self):
+        super().update_status()
+        self._capture_server_times()
+
+class AsyncServerTimesPolling(_ServerTimesMixin, AsyncARMPolling):
+    def initialize(self, client, initial_response, deserialization_callback):
+        super().initialize(client, initial_response, deserialization_callback)
+        self._capture_server_times()
+
+    async def update_status(self):
+        await super().update_status()
+        self._capture_server_times()
+
+# Adaptive polling defaults (seconds)
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+# Poll at MIN_POLL_INTERVAL within this fraction of the expected duration
+EXPECTED_WINDOW = 0.15
+
+def parse_retry_after(response):
+    try:
+        value = response.http_response.headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (AttributeError, ValueError):
+        return None
+
+class _AdaptiveMixin:
+    """
+    Chooses the delay before each status poll. With an expected
+    completion time (from earlier runs of the same region/size/phase)
+    the poller sleeps through most of that time, polls every
+    MIN_POLL_INTERVAL around it and backs off once it has passed.
+    Without history it backs off exponentially from MIN_POLL_INTERVAL.
+    A Retry-After header is honoured as the minimum delay.
+    """
+
+    def __init__(self, *args, expected_seconds=None, min_interval=MIN_POLL_INTERVAL,
+                 max_interval=MAX_POLL_INTERVAL, backoff=BACKOFF_FACTOR, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.expected_seconds = expected_seconds
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.polls = 0
+        self._backoff_polls = 0
+        self._started = None
+
+    def _begin_timing(self):
+        self._started = time.monotonic()
+
+    def _adaptive_delay(self):
+        elapsed = time.monotonic() - self._started
+        delay = None
+
+        if self.expected_seconds:
+            remaining = self.expected_seconds - elapsed
+            window = max(2 * self.min_interval, self.expected_seconds * EXPECTED_WINDOW)
+            if remaining > window:
+                # Sleep towards the start of the expected window
+                delay = min(self.max_interval, max(self.min_interval, remaining - window))
+            elif remaining > -window:
+                delay = self.min_interval
+
+        if delay is None:
+            delay = min(self.max_interval, self.min_interval * self.backoff ** self._backoff_polls)
+            self._backoff_polls += 1
+
+        retry_after = parse_retry_after(self._pipeline_response)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _extract_delay(self):
+        return self._adaptive_delay()
+
+class AdaptivePolling(_AdaptiveMixin, ServerTimesPolling):
+    def initialize(self, client, initial_response, deserialization_callback):
+        self._begin_timing()
+        # The poller runs on its own thread; carry the caller's governor stats over
+        self._governor_stats = governor.current_stats()
+        super().initialize(client, initial_response, deserialization_callback)
+
+    def run(self):
+        with governor.bind(self._governor_stats):
+            super().run()
+
+    def update_status(self):
+        self.polls += 1
+        super().update_status()
+
+class AsyncAdaptivePolling(_AdaptiveMixin, AsyncServerTimesPolling):
+    def initialize(self, client, initial_response, deserialization_callback):
+        self._begin_timing()
+        super().initialize(client, initial_response, deserialization_callback)
+
+    async def update_status(self):
+        self.polls += 1
+        await super().update_status()
+
+def expected_durations(log_entries):
+    """
+    Builds {(location, vm_size, phase): median completion_seconds} from
+    earlier deployment log entries, for use as AdaptivePolling history.
+    """
+    samples = {}
+    for entry in log_entries:
+        if entry.get('status') == 'failed':
+            continue
+        for phase, span in (entry.get('phases') or {}).items():
+            if span.get('completion_seconds'):
+                key = (entry.get('location'), entry.get('vm_size'), phase)
+                samples.setdefault(key, []).append(span['completion_seconds'])
+
+    expected = {}
+    for key, values in samples.items():
+        values.sort()
+        expected[key] = values[len(values) // 2]
+    return expected
+
+def expected_for(history, location, vm_size):
+    """
+    Narrows expected_durations() output to {phase: seconds} for one
+    region and VM size.
+    """
+    return {
+        phase: seconds
+        for (loc, size, phase), seconds in (history or {}).items()
+        if loc == location and size == vm_size
+    }
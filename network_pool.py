@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ResourceNotFoundError
+from azure.mgmt.network import NetworkManagementClient
+from azure.mgmt.resource import ResourceManagementClient
+from azure_clients import get_client
+from DeployVM import vnet_parameters, public_ip_parameters, nic_parameters
+
+# Pool resource groups are named f"{POOL_PREFIX}-{region}" and kept between runs
+POOL_PREFIX = "benchpool"
+
+class NetworkPool:
+    """
+    Pre-provisioned VNet, public IPs and NICs per region, kept in a
+    long-lived resource group so a deployment only has to create the VM.
+    A NIC is leased for one deployment and released once its VM is gone;
+    NICs not attached to a VM are picked up again by later runs.
+    """
+
+    def __init__(self, credential, subscription_id, prefix=POOL_PREFIX):
+        self.credential = credential
+        self.subscription_id = subscription_id
+        self.prefix = prefix
+        self.resource_client = get_client(ResourceManagementClient, credential, subscription_id)
+        self.network_client = get_client(NetworkManagementClient, credential, subscription_id)
+        self._lock = threading.Lock()
+        self._region_locks = {}
+        self._free = {}
+        self._next_index = {}
+        self._subnets = {}
+
+    def resource_group(self, region):
+        return f"{self.prefix}-{region}"
+
+    def _region_lock(self, region):
+        with self._lock:
+            return self._region_locks.setdefault(region, threading.Lock())
+
+    def _discover(self, region):
+        """
+        Creates the region's pool resource group and VNet if needed and
+        loads the NICs that are not attached to a VM. Called once per
+        region under its region lock.
+        """
+        rg_name = self.resource_group(region)
+        try:
+            self.resource_client.resource_groups.get(rg_name)
+        except ResourceNotFoundError:
+            print(f"[{region}] Creating network pool '{rg_name}'...")
+            self.resource_client.resource_groups.create_or_update(rg_name, {"location": region})
+
+        vnet_name = f"{self.prefix}-vnet"
+        subnet_name = f"{self.prefix}-subnet"
+        try:
+            subnet = self.network_client.subnets.get(rg_name, vnet_name, subnet_name)
+        except ResourceNotFoundError:
+            self.network_client.virtual_networks.begin_create_or_update(
+                rg_name, vnet_name, vnet_parameters(region, subnet_name)
+            ).result()
+            subnet = self.network_client.subnets.get(rg_name, vnet_name, subnet_name)
+
+        nics = list(self.network_client.network_interfaces.list(rg_name))
+        with self._lock:
+            self._subnets[region] = subnet
+            self._free[region] = [nic for nic in nics if getattr(nic, "virtual_machine", None) is None]
+            # NICs may have been deleted out of order, so don't count them
+            self._next_index[region] = max((self._nic_index(nic.name) for nic in nics), default=-1) + 1
+
+    def _nic_index(self, name):
+        """Index n of a pool NIC named <prefix>-n-nic, -1 for any other name."""
+        index = name[len(self.prefix) + 1:-len("-nic")]
+        if name.startswith(f"{self.prefix}-") and name.endswith("-nic") and index.isdigit():
+            return int(index)
+        return -1
+
+    def _ensure_region(self, region):
+        with self._region_lock(region):
+            if region not in self._subnets:
+                self._discover(region)
+
+    def _create_nic(self, region):
+        with self._lock:
+            index = self._next_index[region]
+            self._next_index[region] += 1
+            subnet = self._subnets[region]
+
+        rg_name = self.resource_group(region)
+        public_ip = self.network_client.public_ip_addresses.begin_create_or_update(
+            rg_name, f"{self.prefix}-{index}-ip", public_ip_parameters(region)
+        ).result()
+        return self.network_client.network_interfaces.begin_create_or_update(
+            rg_name, f"{self.prefix}-{index}-nic", nic_parameters(region, subnet.id, public_ip.id)
+        ).result()
+
+    def fill(self, region, size=1):
+        """Makes sure at least size free NICs are ready in region."""
+        self._ensure_region(region)
+        with self._lock:
+            missing = max(0, size - len(self._free[region]))
+        if missing:
+            print(f"[{region}] Adding {missing} NIC(s) to the network pool...")
+            with ThreadPoolExecutor(max_workers=missing, thread_name_prefix="pool") as executor:
+                nics = list(executor.map(lambda _: self._create_nic(region), range(missing)))
+            with self._lock:
+                self._free[region].extend(nics)
+
+    def prepare(self, regions, size=1):
+        """Fills every region's pool concurrently."""
+        with ThreadPoolExecutor(max_workers=len(regions), thread_name_prefix="pool") as executor:
+            list(executor.map(lambda region: self.fill(region, size), regions))
+
+    def lease(self, region):
+        """Returns a free NIC in region, provisioning one if the pool is empty."""
+        self._ensure_region(region)
+        with self._lock:
+            if self._free[region]:
+                return self._free[region].pop()
+        return self._create_nic(region)
+
+    def release(self, region, nic):
+        """Returns a NIC to the pool. Its VM must already be deleted."""
+        with self._lock:
+            self._free[region].append(nic)
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import time
+from lro_polling import AdaptivePolling, AsyncAdaptivePolling
+from arm_governor import governor, GovernorStats
+from resource_graph import DeploymentCancelled
+
+# How often an LRO wait checks the cancel event
+CANCEL_CHECK_SECONDS = 0.25
+
+# Order phases are reported and stacked in
+PHASES = ["resource_group", "vnet", "subnet", "public_ip", "nic", "vm"]
+
+class PhaseTimer:
+    """
+    Records per-phase timings for one deployment using the monotonic
+    clock. For a long-running operation, submit_seconds is how long the
+    begin_* call took to be accepted and completion_seconds how long
+    .result() then waited; plain calls only have submit_seconds.
+
+    Every LRO is polled with AdaptivePolling, seeded with the expected
+    completion time for that phase when one is known, and the number of
+    status polls is recorded.
+
+    With server_timestamps=True, LROs also record the server-side start
+    and end of the operation (async-operation startTime/endTime, falling
+    back to the resource's time_created for the start), which excludes
+    the client's polling interval.
+
+    Time spent waiting on the ARM governor (pacing and 429 backoff) is
+    recorded per phase as governor_wait_seconds/throttles, so it can be
+    told apart from Azure's own provisioning time.
+
+    With a checkpoint (run_journal.PhaseCheckpoint), each LRO's
+    continuation token is journaled once submitted, and a phase that was
+    in flight when an earlier run stopped is re-attached rather than
+    started again.
+
+    With a cancel event (threading.Event), LRO waits give up with
+    DeploymentCancelled once it is set; the operation itself carries on
+    in Azure and is left to the caller to clean up.
+    """
+
+    def __init__(self, server_timestamps=False, expected=None, checkpoint=None, cancel=None):
+        self.phases = {}
+        self.server_timestamps = server_timestamps
+        self.expected = expected or {}
+        self.checkpoint = checkpoint
+        self.cancel = cancel
+        self.resumed = False
+        self._origin = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _record(self, phase, started, submitted, finished, stats=None):
+        with self._lock:
+            self.phases[phase] = {
+                "start_offset_seconds": round(started - self._origin, 3),
+                "submit_seconds": round(submitted - started, 3),
+                "completion_seconds": round(finished - submitted, 3),
+                "total_seconds": round(finished - started, 3)
+            }
+            if stats is not None:
+                self.phases[phase]["governor_wait_seconds"] = round(stats.wait_seconds, 3)
+                self.phases[phase]["throttles"] = stats.throttles
+
+    def _record_polling(self, phase, polling, result):
+        with self._lock:
+            self.phases[phase]["polls"] = polling.polls
+        if self.server_timestamps:
+            self._record_server_times(phase, polling, result)
+
+    def _record_server_times(self, phase, polling, result):
+        start = polling.server_start_time or getattr(result, "time_created", None)
+        end = polling.server_end_time
+        if start is None or end is None:
+            return
+        with self._lock:
+            self.phases[phase].update({
+                "server_start_time_utc": start.isoformat(),
+                "server_end_time_utc": end.isoformat(),
+                "server_seconds": round((end - start).total_seconds(), 3)
+            })
+
+    def call(self, phase, func, *args, **kwargs):
+        with governor.bind(GovernorStats()) as stats:
+            started = time.monotonic()
+            result = func(*args, **kwargs)
+            finished = time.monotonic()
+        self._record(phase, started, finished, finished, stats)
+        return result
+
+    def _resume_token(self, phase, kwargs):
+        token = self.checkpoint.continuation_token(phase) if self.checkpoint else None
+        if token:
+            kwargs["continuation_token"] = token
+            with self._lock:
+                self.resumed = True
+
+    def _wait(self, phase, poller):
+        if self.checkpoint is not None:
+            self.checkpoint.submitted(phase, poller.continuation_token())
+        try:
+            if self.cancel is not None:
+                while not poller.done():
+                    if self.cancel.is_set():
+                        raise DeploymentCancelled(f"{phase} abandoned")
+                    poller.wait(CANCEL_CHECK_SECONDS)
+            return poller.result()
+        except Exception:
+            if self.checkpoint is not None:
+                self.checkpoint.failed(phase)
+            raise
+
+    def _finish(self, phase):
+        if self.checkpoint is not None:
+            self.checkpoint.done(phase)
+
+    def lro(self, phase, begin, *args, **kwargs):
+        polling = AdaptivePolling(expected_seconds=self.expected.get(phase))
+        kwargs["polling"] = polling
+        self._resume_token(phase, kwargs)
+
+        with governor.bind(GovernorStats()) as stats:
+            started = time.monotonic()
+            poller = begin(*args, **kwargs)
+            submitted = time.monotonic()
+            result = self._wait(phase, poller)
+            finished = time.monotonic()
+        self._record(phase, started, submitted, finished, stats)
+        self._finish(phase)
+
+        self._record_polling(phase, polling, result)
+        return result
+
+    async def call_async(self, phase, func, *args, **kwargs):
+        # bind() is context-local, so concurrent tasks keep their own stats
+        with governor.bind(GovernorStats()) as stats:
+            started = time.monotonic()
+            result = await func(*args, **kwargs)
+            finished = time.monotonic()
+        self._record(phase, started, finished, finished, stats)
+        return result
+
+    async def lro_async(self, phase, begin, *args, **kwargs):
+        polling = AsyncAdaptivePolling(expected_seconds=self.expected.get(phase))
+        kwargs["polling"] = polling
+        self._resume_token(phase, kwargs)
+
+        with governor.bind(GovernorStats()) as stats:
+            started = time.monotonic()
+            poller = await begin(*args, **kwargs)
+            submitted = time.monotonic()
+            # Journal writes are fsynced; keep them off the event loop
+            if self.checkpoint is not None:
+                await asyncio.to_thread(self.checkpoint.submitted, phase, poller.continuation_token())
+            try:
+                result = await poller.result()
+            except Exception:
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(self.checkpoint.failed, phase)
+                raise
+            finished = time.monotonic()
+        self._record(phase, started, submitted, finished, stats)
+        await asyncio.to_thread(self._finish, phase)
+
+        self._record_polling(phase, polling, result)
+        return result
+
+    def elapsed(self):
+        return round(time.monotonic() - self._origin, 3)
+
+    def total(self, phase):
+        return self.phases[phase]["total_seconds"]
+
+    def governor_wait(self, phase=None):
+        phases = [self.phases.get(phase, {})] if phase else self.phases.values()
+        return round(sum(p.get("governor_wait_seconds", 0.0) for p in phases), 3)
+
+    def throttles(self):
+        return sum(p.get("throttles", 0) for p in self.phases.values())
+
+    def server_seconds(self, phase):
+        return self.phases.get(phase, {}).get("server_seconds")
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from azure.mgmt.compute import ComputeManagementClient
+from tabulate import tabulate
+from azure_clients import get_client
+from size_catalog import fetch_region_sizes
+
+# How long fetched usage data stays valid for a subscription
+CACHE_TTL_SECONDS = 300
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+class RegionCapacity:
+    """
+    Compute usage and VM size availability for one region: usages maps a
+    quota name ('cores', 'standardDSv3Family', ...) to (current, limit),
+    sizes maps a VM size to its size_catalog entry.
+    """
+
+    def __init__(self, region, usages, sizes):
+        self.region = region
+        self.usages = usages
+        self.sizes = sizes
+        self.fetched = time.monotonic()
+
+    def free(self, quota_name):
+        if quota_name not in self.usages:
+            return None
+        current, limit = self.usages[quota_name]
+        return limit - current
+
+def fetch_region_capacity(credential, subscription_id, region):
+    compute_client = get_client(ComputeManagementClient, credential, subscription_id)
+    usages = {
+        usage.name.value: (usage.current_value, usage.limit)
+        for usage in compute_client.usage.list(region)
+    }
+    # SKUs come from the size catalog, shared with the size prompt
+    return RegionCapacity(region, usages, fetch_region_sizes(credential, subscription_id, region))
+
+def get_region_capacities(credential, subscription_id, regions, max_workers=16):
+    """
+    Returns {region: RegionCapacity}, fetching every region not already
+    cached for this subscription concurrently (reads only).
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        capacities = {
+            region: _cache[(subscription_id, region)]
+            for region in regions
+            if (subscription_id, region) in _cache
+            and now - _cache[(subscription_id, region)].fetched < CACHE_TTL_SECONDS
+        }
+    missing = [region for region in regions if region not in capacities]
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing)), thread_name_prefix="preflight") as executor:
+            fetched = list(executor.map(
+                lambda region: fetch_region_capacity(credential, subscription_id, region), missing
+            ))
+        with _cache_lock:
+            for capacity in fetched:
+                _cache[(subscription_id, capacity.region)] = capacity
+                capacities[capacity.region] = capacity
+
+    return capacities
+
+def check_size(capacity, vm_size):
+    """
+    Returns None if vm_size can be deployed in the region, otherwise the
+    reason it would fail.
+    """
+    size = capacity.sizes.get(vm_size)
+    if size is None:
+        return "SkuNotAvailable: size not offered in region"
+
+    if size['restricted']:
+        return f"SkuNotAvailable: {size.get('restriction_reason') or 'restricted for this subscription'}"
+
+    vcpus = size['vcpus']
+    regional_free = capacity.free("cores")
+    if regional_free is not None and vcpus > regional_free:
+        return f"QuotaExceeded: needs {vcpus} vCPUs, {regional_free} regional vCPUs free"
+
+    family_free = capacity.free(size['family'])
+    if family_free is not None and vcpus > family_free:
+        return f"QuotaExceeded: needs {vcpus} vCPUs, {family_free} free in {size['family']}"
+
+    return None
+
+def run_preflight(credential, subscription_id, regions, vm_sizes):
+    """
+    Checks every region/size combination before anything is written.
+    Returns {(region, vm_size): reason} for the combinations that would
+    fail; regions whose data can't be read are not flagged.
+    """
+    print("\nRunning pre-flight quota and SKU checks...")
+    try:
+        capacities = get_region_capacities(credential, subscription_id, regions)
+    except Exception as e:
+        print(f"Pre-flight check skipped: {e}")
+        return {}
+
+    invalid = {}
+    rows = []
+    for region in regions:
+        for vm_size in vm_sizes:
+            reason = check_size(capacities[region], vm_size)
+            if reason:
+                invalid[(region, vm_size)] = reason
+            rows.append([region, vm_size, "OK" if reason is None else "Skip", reason or ""])
+
+    print(tabulate(rows, headers=["Region", "Size", "Pre-flight", "Reason"], tablefmt="grid"))
+    return invalid
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class DeploymentCancelled(Exception):
+    """Raised when a deployment is abandoned through its cancel event."""
+
+class ResourceGraph:
+    """
+    Runs a small dependency graph of provisioning steps. Each node is a
+    function called with the results of its dependencies as keyword
+    arguments; a node is started as soon as all of its dependencies have
+    finished, so independent steps run at the same time.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def add(self, name, func, depends_on=()):
+        for dep in depends_on:
+            if dep not in self._nodes:
+                raise ValueError(f"Node '{name}' depends on unknown node '{dep}'")
+        self._nodes[name] = (func, tuple(depends_on))
+
+    def run(self, max_workers=None, cancel=None):
+        """
+        Executes every node and returns a dict of node name -> result.
+        If a node raises, no further nodes are started; nodes already
+        running are allowed to finish and the first error is re-raised.
+        Setting the optional cancel event (threading.Event) likewise stops
+        new nodes from starting and raises DeploymentCancelled.
+        """
+        results = {}
+        pending = dict(self._nodes)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(self._nodes)),
+                                thread_name_prefix="graph") as executor:
+            while pending or running:
+                if error is None and cancel is not None and cancel.is_set():
+                    error = DeploymentCancelled("Deployment cancelled")
+
+                if error is None:
+                    for name, (func, deps) in list(pending.items()):
+                        if all(dep in results for dep in deps):
+                            kwargs = {dep: results[dep] for dep in deps}
+                            running[executor.submit(func, **kwargs)] = name
+                            del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+
+        if error is not None:
+            raise error
+        return results
@@ -0,0 +1,205 @@
+import datetime
+import json
+import sqlite3
+import threading
+
+RESULTS_DB = "results.db"
+BUSY_TIMEOUT_SECONDS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started_utc TEXT NOT NULL,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS deployments (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT REFERENCES runs(run_id),
+    vm_name TEXT,
+    location TEXT,
+    vm_size TEXT,
+    image TEXT,
+    trial INTEGER,
+    status TEXT,
+    start_time_utc TEXT,
+    end_time_utc TEXT,
+    duration_seconds REAL,
+    total_seconds REAL,
+    server_duration_seconds REAL,
+    governor_wait_seconds REAL,
+    throttle_count INTEGER,
+    release_skew_seconds REAL,
+    resumed INTEGER,
+    error TEXT,
+    recorded_utc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phases (
+    deployment_id INTEGER REFERENCES deployments(id),
+    phase TEXT,
+    start_offset_seconds REAL,
+    submit_seconds REAL,
+    completion_seconds REAL,
+    total_seconds REAL,
+    polls INTEGER,
+    governor_wait_seconds REAL,
+    throttles INTEGER,
+    server_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS latency_samples (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT REFERENCES runs(run_id),
+    vm_name TEXT,
+    location TEXT,
+    ip TEXT,
+    port_used INTEGER,
+    latency_ms REAL,
+    measured_utc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_region ON deployments(location, vm_size, image, recorded_utc);
+CREATE INDEX IF NOT EXISTS idx_deployments_time ON deployments(recorded_utc);
+CREATE INDEX IF NOT EXISTS idx_deployments_run ON deployments(run_id);
+CREATE INDEX IF NOT EXISTS idx_phases_deployment ON phases(deployment_id);
+CREATE INDEX IF NOT EXISTS idx_latency_region ON latency_samples(location, measured_utc);
+CREATE INDEX IF NOT EXISTS idx_latency_run ON latency_samples(run_id);
+"""
+
+DEPLOYMENT_COLUMNS = [
+    "vm_name", "location", "vm_size", "image", "trial", "status", "start_time_utc", "end_time_utc",
+    "duration_seconds", "total_seconds", "server_duration_seconds", "governor_wait_seconds",
+    "throttle_count", "release_skew_seconds", "resumed", "error"
+]
+PHASE_COLUMNS = [
+    "start_offset_seconds", "submit_seconds", "completion_seconds", "total_seconds",
+    "polls", "governor_wait_seconds", "throttles", "server_seconds"
+]
+
+def _utcnow():
+    return datetime.datetime.utcnow().isoformat()
+
+def _since(days):
+    return (datetime.datetime.utcnow() - datetime.timedelta(days=days)).isoformat()
+
+def image_label(vm_image):
+    """The 'publisher:offer:sku' form images are stored and queried by."""
+    if not vm_image:
+        return None
+    return f"{vm_image['publisher']}:{vm_image['offer']}:{vm_image['sku']}"
+
+class ResultsStore:
+    """
+    SQLite history of every run: runs, deployments (one row per log
+    entry), their phases, and latency samples. Nothing is wiped between
+    runs; queries narrow by run, region, size, image and age instead.
+    """
+
+    def __init__(self, path=RESULTS_DB):
+        self.path = path
+        self.run_id = None
+        self._lock = threading.Lock()
+        # Other processes may be writing too; wait for their locks rather than failing
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def start_run(self, run_id, kind, config=None):
+        """Registers a run (again, on resume) and makes it the current one."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, kind, started_utc, config) VALUES (?, ?, ?, ?)",
+                (run_id, kind, _utcnow(), json.dumps(config) if config is not None else None)
+            )
+        self.run_id = run_id
+
+    def add_deployment(self, entry, run_id=None):
+        row = [entry.get(column) for column in DEPLOYMENT_COLUMNS]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO deployments (run_id, {', '.join(DEPLOYMENT_COLUMNS)}, recorded_utc) "
+                f"VALUES ({', '.join('?' * (len(DEPLOYMENT_COLUMNS) + 2))})",
+                [run_id or self.run_id] + row + [_utcnow()]
+            )
+            self._conn.executemany(
+                f"INSERT INTO phases (deployment_id, phase, {', '.join(PHASE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(PHASE_COLUMNS) + 2))})",
+                [
+                    [cursor.lastrowid, phase] + [span.get(column) for column in PHASE_COLUMNS]
+                    for phase, span in (entry.get("phases") or {}).items()
+                ]
+            )
+
+    def add_latency(self, sample, run_id=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO latency_samples (run_id, vm_name, location, ip, port_used, latency_ms, measured_utc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id or self.run_id, sample.get("vm_name"), sample.get("location"), sample.get("ip"),
+                 sample.get("port_used"), sample.get("latency_ms"), _utcnow())
+            )
+
+    def _where(self, filters, days, time_column):
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        if days is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(_since(days))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def deployments(self, run_id=None, location=None, vm_size=None, image=None, status=None, days=None):
+        """
+        Returns matching deployments as log-entry dicts (with a 'phases'
+        dict, like deployment_log.jsonl), oldest first.
+        """
+        where, params = self._where(
+            {"run_id": run_id, "location": location, "vm_size": vm_size, "image": image, "status": status},
+            days, "recorded_utc"
+        )
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM deployments{where} ORDER BY id", params).fetchall()
+            phase_rows = self._conn.execute(
+                f"SELECT * FROM phases WHERE deployment_id IN (SELECT id FROM deployments{where}) ORDER BY rowid", params
+            ).fetchall()
+
+        phases = {}
+        for row in phase_rows:
+            phases.setdefault(row["deployment_id"], {})[row["phase"]] = {
+                column: row[column] for column in PHASE_COLUMNS if row[column] is not None
+            }
+
+        entries = []
+        for row in rows:
+            entry = {
+                column: row[column]
+                for column in ["run_id"] + DEPLOYMENT_COLUMNS + ["recorded_utc"]
+                if row[column] is not None
+            }
+            if row["id"] in phases:
+                entry["phases"] = phases[row["id"]]
+            entries.append(entry)
+        return entries
+
+    def latency_samples(self, run_id=None, location=None, days=None):
+        where, params = self._where({"run_id": run_id, "location": location}, days, "measured_utc")
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM latency_samples{where} ORDER BY id", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_run(self, kind):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM runs WHERE kind = ? ORDER BY started_utc DESC LIMIT 1", (kind,)
+            ).fetchone()
+        return row["run_id"] if row else None
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Returns the process-wide results store, opening results.db on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultsStore()
+        return _store
@@ -0,0 +1,83 @@
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from jsonl_log import DEPLOYMENT_LOG, LATENCY_LOG, append_record
+from results_store import get_store
+
+class ResultsWriter:
+    """
+    Single background thread that owns every write of a result record,
+    both to its JSONL log and to the results store. Deployment threads
+    only enqueue, so logging never blocks them on a file or database
+    lock unless they wait on the Future submit() returns. Across
+    processes, appends are serialised by an exclusive file lock and
+    SQLite's own locking.
+    """
+
+    def __init__(self):
+        # --fsync-logs: fsync every deployment record (callers also wait for it)
+        self.fsync_deployments = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, record, fsync=False):
+        """
+        Queues a 'deployment' or 'latency' record without blocking. Returns
+        a Future that completes once the record is in both the log and the
+        store (and fsynced, if asked); wait on it before anything that
+        assumes the record survives a crash.
+        """
+        path = DEPLOYMENT_LOG if kind == "deployment" else LATENCY_LOG
+        fsync = fsync or (kind == "deployment" and self.fsync_deployments)
+        done = Future()
+        # Resolve now: the caller's working directory and run are what count
+        self._queue.put((done, (kind, os.path.abspath(path), record, get_store().run_id, fsync)))
+        return done
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                done, args = item
+                try:
+                    self._write(*args)
+                except Exception as e:
+                    print(f"Failed to save result record: {e}")
+                    done.set_exception(e)
+                else:
+                    done.set_result(None)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, kind, path, record, run_id, fsync):
+        append_record(path, record, fsync=fsync)
+        if kind == "deployment":
+            get_store().add_deployment(record, run_id=run_id)
+        else:
+            get_store().add_latency(record, run_id=run_id)
+
+    def flush(self):
+        """Blocks until every record queued so far has been written."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_writer():
+    """Returns the process-wide results writer, starting it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ResultsWriter()
+            # Drain anything still queued before the interpreter exits
+            atexit.register(_writer.close)
+        return _writer
@@ -0,0 +1,121 @@
+import datetime
+import json
+import os
+import secrets
+import threading
+
+JOURNAL_DIR = "runs"
+
+def new_run_id():
+    # The random suffix keeps runs started in the same second apart;
+    # export_parquet reads the run date from the leading YYYYMMDD
+    return datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S-") + secrets.token_hex(3)
+
+class RunJournal:
+    """
+    Write-ahead journal for one deployment run, stored as one JSON record
+    per line in runs/<run_id>.jsonl and fsynced on every write. Replaying
+    it gives the run's saved configuration, the trials that completed and
+    the continuation tokens of LROs that were still in flight.
+
+    A unit is one region's resource group (one matrix cell in a matrix
+    run); phases are tracked per (unit, trial).
+    """
+
+    def __init__(self, run_id, directory=JOURNAL_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self.config = None
+        self._done = set()
+        self._tokens = {}
+        self._torn_tail = False
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            self._replay()
+
+    def _replay(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                self._torn_tail = not line.endswith("\n")
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash can leave a torn last line; everything before it is intact
+                    continue
+                self._apply(record)
+
+    def _apply(self, record):
+        kind = record["type"]
+        if kind == "run":
+            self.config = record["config"]
+        elif kind == "phase":
+            key = (record["unit"], record["trial"], record["phase"])
+            if record["state"] == "submitted":
+                self._tokens[key] = record["continuation_token"]
+            else:
+                self._tokens.pop(key, None)
+        elif kind == "trial" and record["state"] == "done":
+            self._done.add((record["unit"], record["trial"]))
+
+    def _write(self, record):
+        record["time_utc"] = datetime.datetime.utcnow().isoformat()
+        with self._lock:
+            with open(self.path, "a") as f:
+                if self._torn_tail:
+                    f.write("\n")
+                    self._torn_tail = False
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(record)
+
+    def start(self, config):
+        self._write({"type": "run", "config": config})
+
+    def is_trial_done(self, unit, trial):
+        return (unit, trial) in self._done
+
+    def trial_done(self, unit, trial):
+        self._write({"type": "trial", "unit": unit, "trial": trial, "state": "done"})
+
+    def continuation_token(self, unit, trial, phase):
+        return self._tokens.get((unit, trial, phase))
+
+    def phase(self, unit, trial, phase, state, continuation_token=None):
+        self._write({
+            "type": "phase",
+            "unit": unit,
+            "trial": trial,
+            "phase": phase,
+            "state": state,
+            "continuation_token": continuation_token
+        })
+
+    def checkpoint(self, unit, trial):
+        return PhaseCheckpoint(self, unit, trial)
+
+class PhaseCheckpoint:
+    """
+    A RunJournal bound to one (unit, trial), handed to PhaseTimer so each
+    LRO records its continuation token once submitted and re-attaches to
+    it on resume instead of starting a new operation.
+    """
+
+    def __init__(self, journal, unit, trial):
+        self.journal = journal
+        self.unit = unit
+        self.trial = trial
+
+    def continuation_token(self, phase):
+        return self.journal.continuation_token(self.unit, self.trial, phase)
+
+    def submitted(self, phase, continuation_token):
+        self.journal.phase(self.unit, self.trial, phase, "submitted", continuation_token)
+
+    def done(self, phase):
+        self.journal.phase(self.unit, self.trial, phase, "done")
+
+    def failed(self, phase):
+        self.journal.phase(self.unit, self.trial, phase, "failed")
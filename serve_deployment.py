@@ -1,4 +1,8 @@
-from flask import Flask, send_file, render_template_string
+import datetime
+import io
+from matplotlib.figure import Figure
+from flask import Flask, send_file, render_template_string, request
+from results_store import get_store
 
 app = Flask(__name__)
 
@@ -57,5 +61,39 @@ def image():
 def download():
     return send_file('output.png', as_attachment=True)
 
+@app.route('/history')
+def history():
+    # e.g. /history?region=eastus&size=Standard_D2s_v3&days=30
+    region = request.args.get('region')
+    size = request.args.get('size')
+    days = request.args.get('days', 30, type=int)
+    entries = get_store().deployments(location=region, vm_size=size, image=request.args.get('image'),
+                                      status="succeeded", days=days)
+
+    # A Figure per request: pyplot's global state isn't safe across Flask's threads
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    series = {}
+    for entry in entries:
+        series.setdefault(f"{entry['location']} / {entry.get('vm_size')}", []).append(
+            (datetime.datetime.fromisoformat(entry['start_time_utc']), entry['duration_seconds']))
+    for label, points in sorted(series.items()):
+        ax.plot([p[0] for p in points], [p[1] for p in points], marker='o', label=label)
+
+    ax.set_title(f"VM Deployment Duration, last {days} days", fontsize=14)
+    ax.set_xlabel('Start Time (UTC)', fontsize=12)
+    ax.set_ylabel('Deployment Duration (seconds)', fontsize=12)
+    if series:
+        ax.legend()
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+
+    image = io.BytesIO()
+    fig.savefig(image, format='png')
+    image.seek(0)
+    return send_file(image, mimetype='image/png')
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000)
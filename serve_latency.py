@@ -1,4 +1,8 @@
-from flask import Flask, send_file, render_template_string
+import datetime
+import io
+from matplotlib.figure import Figure
+from flask import Flask, send_file, render_template_string, request
+from results_store import get_store
 
 app = Flask(__name__)
 
@@ -58,5 +62,36 @@ def image():
 def download():
     return send_file('latency_graph.png', as_attachment=True)
 
+@app.route('/history')
+def history():
+    # e.g. /history?region=eastus&days=30
+    days = request.args.get('days', 30, type=int)
+    samples = get_store().latency_samples(location=request.args.get('region'), days=days)
+
+    # A Figure per request: pyplot's global state isn't safe across Flask's threads
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    series = {}
+    for sample in samples:
+        series.setdefault(f"{sample['location']} / {sample['vm_name']}", []).append(
+            (datetime.datetime.fromisoformat(sample['measured_utc']), sample['latency_ms']))
+    for label, points in sorted(series.items()):
+        ax.plot([p[0] for p in points], [p[1] for p in points], marker='o', label=label)
+
+    ax.set_title(f"TCP Latency to Azure VMs, last {days} days", fontsize=14)
+    ax.set_xlabel('Measured (UTC)')
+    ax.set_ylabel('Latency (ms)')
+    if series:
+        ax.legend()
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+
+    image = io.BytesIO()
+    fig.savefig(image, format='png')
+    image.seek(0)
+    return send_file(image, mimetype='image/png')
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001)
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from azure.mgmt.compute import ComputeManagementClient
+from azure_clients import get_client
+from catalog_cache import get_catalog
+
+def _capability(sku, name, default=None):
+    for capability in sku.capabilities or []:
+        if capability.name == name:
+            return capability.value
+    return default
+
+def size_entry(sku, location):
+    """
+    Flattens a virtualMachines resource SKU into the JSON-friendly record
+    the index stores. Zones restricted for this subscription are dropped.
+    """
+    zones = set()
+    for location_info in sku.location_info or []:
+        if location_info.location.lower() == location.lower():
+            zones.update(location_info.zones or [])
+
+    restricted = False
+    restriction_reason = None
+    for restriction in sku.restrictions or []:
+        if restriction.type == "Location":
+            restricted = True
+            restriction_reason = restriction.reason_code
+        elif restriction.type == "Zone" and restriction.restriction_info:
+            zones.difference_update(restriction.restriction_info.zones or [])
+
+    return {
+        'name': sku.name,
+        'family': sku.family,
+        'vcpus': int(_capability(sku, "vCPUs", 0)),
+        'memory_gb': float(_capability(sku, "MemoryGB", 0)),
+        'max_data_disks': int(_capability(sku, "MaxDataDiskCount", 0)),
+        'accelerated_networking': _capability(sku, "AcceleratedNetworkingEnabled", "False") == "True",
+        'ephemeral_os_disk': _capability(sku, "EphemeralOSDiskSupported", "False") == "True",
+        'zones': sorted(zones),
+        'restricted': restricted,
+        'restriction_reason': restriction_reason
+    }
+
+def fetch_region_sizes(credential, subscription_id, location):
+    """
+    Returns {size name: size entry} for location, built from one
+    resource_skus call and kept in the on-disk catalog cache.
+    """
+    def fetch():
+        compute_client = get_client(ComputeManagementClient, credential, subscription_id)
+        return {
+            sku.name: size_entry(sku, location)
+            for sku in compute_client.resource_skus.list(filter=f"location eq '{location}'")
+            if sku.resource_type == "virtualMachines"
+        }
+
+    return get_catalog().get('sizes', f"{subscription_id}:{location}", fetch)
+
+class SizeIndex:
+    """
+    In-memory VM size capabilities per region. Built once with load();
+    every query afterwards is answered without calling Azure.
+    """
+
+    def __init__(self, sizes_by_region):
+        self.sizes_by_region = sizes_by_region
+
+    @classmethod
+    def load(cls, credential, subscription_id, regions, max_workers=8):
+        regions = list(regions)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(regions)), thread_name_prefix="size-index") as executor:
+            sizes = executor.map(lambda region: fetch_region_sizes(credential, subscription_id, region), regions)
+            return cls(dict(zip(regions, sizes)))
+
+    def available(self, region):
+        """Sizes this subscription can deploy in region."""
+        return [size for size in self.sizes_by_region.get(region, {}).values() if not size['restricted']]
+
+    def find(self, regions=None, min_vcpus=0, min_memory_gb=0, accelerated_networking=False,
+             ephemeral_os_disk=False, min_zones=0, names=None, prices=None):
+        """
+        Returns the sizes available in every one of regions (default: all
+        indexed regions) that meet the requirements, cheapest first. Without
+        a prices dict ({size name: hourly price}) vCPUs and then memory are
+        used as the cost proxy.
+        """
+        regions = list(regions or self.sizes_by_region)
+        matches = []
+        for size in self.available(regions[0]):
+            if names is not None and size['name'] not in names:
+                continue
+            in_all = [self.sizes_by_region[region].get(size['name']) for region in regions]
+            if any(entry is None or entry['restricted'] for entry in in_all):
+                continue
+            if (size['vcpus'] < min_vcpus or size['memory_gb'] < min_memory_gb
+                    or (accelerated_networking and not size['accelerated_networking'])
+                    or (ephemeral_os_disk and not size['ephemeral_os_disk'])
+                    or min(len(entry['zones']) for entry in in_all) < min_zones):
+                continue
+            matches.append(size)
+
+        def cost(size):
+            price = (prices or {}).get(size['name'])
+            return (price is None, price or 0, size['vcpus'], size['memory_gb'], size['name'])
+
+        return sorted(matches, key=cost)
+
+    def cheapest(self, regions=None, **requirements):
+        matches = self.find(regions, **requirements)
+        return matches[0] if matches else None
@@ -0,0 +1,51 @@
+import threading
+import time
+
+class StartBarrier:
+    """
+    Holds every region's VM create until all regions have their network
+    prerequisites ready, then releases them together. A region that fails
+    (or skips) before reaching the barrier withdraws so the others are not
+    held forever. Each release is recorded on the perf_counter clock so the
+    actual skew between regions can be reported.
+    """
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.released_at = None
+        self.releases = {}
+        self._arrived = set()
+        self._withdrawn = set()
+        self._condition = threading.Condition()
+
+    def _release_if_ready(self):
+        if self.released_at is None and len(self._arrived) + len(self._withdrawn) >= self.parties:
+            self.released_at = time.perf_counter()
+            self._condition.notify_all()
+
+    def wait(self, name):
+        """
+        Blocks until every party has arrived or withdrawn. Returns this
+        party's release skew in seconds (how long after the release
+        instant it actually resumed).
+        """
+        with self._condition:
+            self._arrived.add(name)
+            self._release_if_ready()
+            while self.released_at is None:
+                self._condition.wait()
+        skew = time.perf_counter() - self.released_at
+        with self._condition:
+            self.releases[name] = skew
+        return skew
+
+    def withdraw(self, name):
+        """Removes a party that will never call wait(). No-op once it has."""
+        with self._condition:
+            if name not in self._arrived:
+                self._withdrawn.add(name)
+                self._release_if_ready()
+
+    def max_skew(self):
+        with self._condition:
+            return max(self.releases.values()) if self.releases else None